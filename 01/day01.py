@@ -1,71 +1,159 @@
-import sys
 import re
 
+from aoc.inputs import BYTES, STREAM, iter_line_chunks
+
 DAY = 1
+# part 1 is summed over the whole buffer at once, part 2 scans the lines one by one
+INPUT_MODE = {1: BYTES, 2: STREAM}
+# chars searched at once for the last char that starts a word, doubled for every window further back
+SKIP_WINDOW = 64
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+# define the digits and spelled digits with the value they add
+digits = {str(d): d for d in range(10)}
+spelled_digits = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+spelled_digits_dict = {digit: idx + 1 for idx, digit in enumerate(spelled_digits)}
 
 
-# define spelled digits for regex and adding
-spelled_digits = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
-digits_dict = {digit[:-1]: str(idx + 1) for idx, digit in enumerate(spelled_digits)}
+def build_automaton(vocabulary):
+    # Aho-Corasick automaton of the words in `vocabulary` (word -> value) as a DFA:
+    # transitions[state] maps each char to the next state, with the failure links folded in, so that
+    # scanning takes one dict lookup per char; matches[state] lists the (length, value) of the
+    # words ending in that state, longest first; `word_starts` finds the next char that starts a word
+    # and `last_word_start` the last one (its greedy prefix backs off from the end of the window)
+    transitions = [{}]
+    matches = [[]]
+    for word, value in vocabulary.items():
+        state = 0
+        for char in word:
+            if char not in transitions[state]:
+                transitions.append({})
+                matches.append([])
+                transitions[state][char] = len(transitions) - 1
+            state = transitions[state][char]
+        matches[state].append((len(word), value))
+    # breadth first, so that the failure state of every state is complete before it is used
+    failures = [0] * len(transitions)
+    queue = list(transitions[0].values())
+    for state in queue:
+        failure = failures[state]
+        matches[state] = sorted(matches[state] + matches[failure], reverse=True)
+        for char, next_state in transitions[state].items():
+            queue.append(next_state)
+            failures[next_state] = transitions[failure].get(char, 0)
+        # chars without a transition of their own continue from the failure state
+        for char, next_state in transitions[failure].items():
+            if char not in transitions[state]:
+                transitions[state][char] = next_state
+    max_length = max(len(word) for word in vocabulary)
+    start_chars = '|'.join(re.escape(char) for char in transitions[0])
+    word_starts = re.compile(start_chars)
+    last_word_start = re.compile(f'(?s:.*)(?:{start_chars})')
+    return transitions, matches, max_length, word_starts, last_word_start
 
-# define patterns
-spelled_digits_pattern = '|'.join([f'{digit[:-1]}(?={digit[-1]})' for digit in spelled_digits])
 
-# Part 1
-pattern_1 = re.compile("([0-9])")
-# Part 2
-pattern_2 = re.compile(r'([0-9]|{spelled_digits_pattern})'.format(spelled_digits_pattern=spelled_digits_pattern))
+def find_last_start(last_word_start, text, end):
+    # index of the last char before `end` that starts a word, -1 if there is none; the windows grow
+    # backwards from `end` so that the cost follows the distance to that char, not the length of `text`
+    size = SKIP_WINDOW
+    while end > 0:
+        start = max(end - size, 0)
+        match = last_word_start.match(text, start, end)
+        if match is not None:
+            return match.end() - 1
+        end = start
+        size *= 2
+    return -1
 
 
-def solve(input, part):
+def find_first(automaton, text, backward=False):
+    # (start, value) of the leftmost word in `text`, of the longest if several start there, None if
+    # there is none; scanning stops as soon as no word starting there or further left can end anymore.
+    # With `backward` the chars are read from the end of `text` (for an automaton of reversed words)
+    # and i, like the returned start, counts from the end
+    transitions, matches, max_length, word_starts, last_word_start = automaton
+    state = 0
+    first = None
+    i = 0
+    while i < len(text):
+        if state == 0:
+            # no word is partly matched, so the next one starts after the one found
+            if first is not None:
+                break
+            # chars that cannot start a word are skipped by the regex engine
+            if backward:
+                start = find_last_start(last_word_start, text, len(text) - i)
+                if start < 0:
+                    break
+                i = len(text) - 1 - start
+            else:
+                match = word_starts.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+        char = text[len(text) - 1 - i] if backward else text[i]
+        state = transitions[state].get(char, 0)
+        if matches[state]:
+            length, value = matches[state][0]
+            if first is None or (i - length + 1, -length) < (first[0], -first[1]):
+                first = (i - length + 1, length, value)
+        if first is not None and i >= first[0] + max_length - 1:
+            break
+        i += 1
+    return None if first is None else (first[0], first[2])
+
+
+def build_scanners(vocabulary):
+    # the first word is found scanning forward, the last one (the rightmost) scanning the line backwards
+    # from its end for the reversed words
+    forward = build_automaton(vocabulary)
+    backward = build_automaton({word[::-1]: value for word, value in vocabulary.items()})
+    return forward, backward
+
+
+# part 2 (part 1 only has the digits, see solve_part1)
+scanners = build_scanners(dict(digits, **spelled_digits_dict))
+
+
+def get_calibration_value(line, scanners):
+    forward, backward = scanners
+    first = find_first(forward, line)
+    if first is None:
+        raise ValueError(f'no digit in line {line!r}')
+    last = find_first(backward, line, backward=True)
+    return first[1] * 10 + last[1]
+
+
+def solve_part1(buffer):
+    # numpy is only needed for part 1, import it when it is used
+    import numpy as np
+
     num_sum = 0
-    line_num = 1  # debug
-    for line in input:
-        matches = re.findall(pattern_1, line) if part == 1 else re.findall(pattern_2, line)
-
-        first = matches[0]
-        if len(first) > 1:
-            first = digits_dict[first]
-        last = matches[-1]
-        if len(last) > 1:
-            last = digits_dict[last]
-
-        num = int(first + last)
-
-        # debug
-        debug = False
-        if line_num % 30 == 3 and debug:
-            print(f'line num: {line_num}\nFull line:\n{line}')
-            print(f'Matches: {matches}')
-            print(f'First: {first}, Last: {last}')
-            print(f'Num: {num}')
-            print()
-            line_num += 1
-
-        num_sum += num
+    for chunk in iter_line_chunks(buffer):
+        chunk = np.frombuffer(chunk, dtype=np.uint8)
+        digit_positions = np.flatnonzero((chunk >= ord('0')) & (chunk <= ord('9')))
+        line_ends = np.flatnonzero(chunk == ord('\n'))
+        # a last line without a line break still counts
+        num_lines = len(line_ends) + (chunk[-1] != ord('\n'))
+        # the digits are in order, so the digits of each line are a run of the same line number
+        lines = np.searchsorted(line_ends, digit_positions)
+        is_first = np.diff(lines, prepend=-1) != 0
+        is_last = np.diff(lines, append=num_lines) != 0
+        if np.count_nonzero(is_first) != num_lines:
+            line = np.setdiff1d(np.arange(num_lines), lines)[0]
+            line_start = line_ends[line - 1] + 1 if line > 0 else 0
+            line_end = line_ends[line] if line < len(line_ends) else len(chunk)
+            line_text = chunk[line_start:line_end].tobytes().decode().rstrip('\r')
+            raise ValueError(f'no digit in line {line_text!r}')
+        num_sum += int(chunk[digit_positions[is_first]].sum(dtype=np.int64) - ord('0') * num_lines) * 10
+        num_sum += int(chunk[digit_positions[is_last]].sum(dtype=np.int64) - ord('0') * num_lines)
     return num_sum
 
 
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
+def solve(input, part):
+    if part == 1:
+        return solve_part1(input)
+    num_sum = 0
+    for line in input:
+        num_sum += get_calibration_value(line, scanners)
+    return num_sum
@@ -1,118 +1,75 @@
-import sys
-import re
 import numpy as np
 
-DAY = 2
-
-ROUNDS_KEY = 'rounds'
-GAME_ID_KEY = 'game_id'
-
-RED_MAX = 12
-GREEN_MAX = 13
-BLUE_MAX = 14
-
-
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
-def preprocess_games(games):
-    i = 0
-    for g in games:
-        g = g.split(': ')[1]
-        g = g.split('; ')
-        games[i] = format_rounds(g, i + 1)
-        i += 1
-    return games
-
+from aoc.inputs import BYTES, iter_line_chunks
+from aoc.ints import find_ints
+from aoc.trace import traced
 
-def format_rounds(rounds, game_id):
-    i = 0
-    game = dict()
-    for r in rounds:
-        cubes = re.findall("([0-9]+) (g(?=reen)|r(?=ed)|b(?=lue))", r)
-        colors = {c[1]: c[0] for c in cubes}
-        rounds[i] = colors
-        i += 1
-    game[GAME_ID_KEY] = game_id
-    game[ROUNDS_KEY] = rounds
-    return game
-
-
-def get_color_counts(r):
-    try:
-        red = int(r['r'])
-    except KeyError:
-        red = 0
-    try:
-        green = int(r['g'])
-    except KeyError:
-        green = 0
-    try:
-        blue = int(r['b'])
-    except KeyError:
-        blue = 0
-    return red, green, blue
+DAY = 2
+INPUT_MODE = BYTES
+
+# colours in the order of the columns of the cube counts, by their initial
+COLORS = b'rgb'
+# cubes of each colour in the bag for part 1
+MAX_CUBES = np.array([12, 13, 14])
+
+
+def get_max_cubes(data):
+    # the game ids and the most cubes of each colour shown in any round of every game of a uint8
+    # array holding whole lines, as a games x 3 array
+    values, starts, ends = find_ints(data)
+    # 'Game 12: 3 blue, 4 red; ...': the id is the number followed by ':', the cube counts are the
+    # numbers followed by ' ' and a colour
+    next_chars = data[np.minimum(ends, len(data) - 1)]
+    colors = data[np.minimum(ends + 1, len(data) - 1)]
+    is_id = next_chars == ord(':')
+    id_starts = starts[is_id]
+    max_cubes = np.zeros((len(id_starts), len(COLORS)), dtype=np.int64)
+    num_counts = 0
+    for i, color in enumerate(COLORS):
+        is_color = (next_chars == ord(' ')) & (colors == color)
+        num_counts += np.count_nonzero(is_color)
+        # the counts belong to the game of the latest id before them, so the counts of a colour are
+        # sorted by game and each game's counts are a run
+        games = np.searchsorted(id_starts, starts[is_color], side='right') - 1
+        if len(games) == 0:
+            continue
+        if games[0] < 0:
+            raise ValueError('cube counts before the first game')
+        run_starts = np.flatnonzero(np.diff(games, prepend=-1))
+        max_cubes[games[run_starts], i] = np.maximum.reduceat(values[is_color], run_starts)
+    if len(id_starts) + num_counts != len(values):
+        raise ValueError('cube counts must be followed by red, green or blue')
+    return values[is_id], max_cubes
+
+
+@traced
+def preprocess_games(buffer):
+    # the game ids and the most cubes of each colour of every game; both parts only need those
+    # maxima, so the rounds themselves are not kept
+    game_ids = []
+    max_cubes = []
+    for chunk in iter_line_chunks(buffer):
+        chunk_game_ids, chunk_max_cubes = get_max_cubes(np.frombuffer(chunk, dtype=np.uint8))
+        game_ids.append(chunk_game_ids)
+        max_cubes.append(chunk_max_cubes)
+    if not game_ids:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(COLORS)), dtype=np.int64)
+    return np.concatenate(game_ids), np.concatenate(max_cubes)
 
 
 # Part 1
-def get_valid_games_sum(games):
-    valid_games = np.ones(len(games), dtype=bool)
-    valid_id_sum = 0
-    i = 0
-    for g in games:
-        rounds = g[ROUNDS_KEY]
-        for r in rounds:
-            red, green, blue = get_color_counts(r)
-            if red > RED_MAX or green > GREEN_MAX or blue > BLUE_MAX:
-                valid_games[i] = False  # hm?
-        if valid_games[i]:
-            valid_id_sum += g[GAME_ID_KEY]
-        i += 1
-
-    return valid_id_sum
+def get_valid_games_sum(game_ids, max_cubes):
+    is_valid = np.all(max_cubes <= MAX_CUBES, axis=1)
+    return int(game_ids[is_valid].sum())
 
 
 # Part 2
-def get_cubes_powersum(games):
-    i = 0
-    powers = np.zeros(len(games))
-    for g in games:
-        fewest = {'r': 0, 'g': 0, 'b': 0}
-        rounds = g[ROUNDS_KEY]
-        for r in rounds:
-            red, green, blue = get_color_counts(r)
-            fewest['r'] = max(fewest['r'], red)
-            fewest['g'] = max(fewest['g'], green)
-            fewest['b'] = max(fewest['b'], blue)
-        powers[i] = fewest['r'] * fewest['g'] * fewest['b']
-        i += 1
-
-    return int(np.sum(powers))
+def get_cubes_powersum(max_cubes):
+    # the fewest cubes of each colour that make a game possible are its maxima
+    return int(np.prod(max_cubes, axis=1).sum())
 
 
 def solve(input, part):
-    games = preprocess_games(input)
-    solution = get_valid_games_sum(games) if part == 1 else get_cubes_powersum(games)
+    game_ids, max_cubes = preprocess_games(input)
+    solution = get_valid_games_sum(game_ids, max_cubes) if part == 1 else get_cubes_powersum(max_cubes)
     return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
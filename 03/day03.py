@@ -1,79 +1,44 @@
-import sys
-import os
 import re
 import numpy as np
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm
+from aoc.grid import dilate, mask, to_lines
+from aoc.inputs import GRID
+from aoc.progress import track
+from aoc.trace import traced
 
 DAY = 3
+INPUT_MODE = GRID
 
 # Part 1 constants
-SYMBOL_PATTERN = r"[^0-9\.]"
+DIGITS = "0123456789"
+EMPTY_SPACE = "."
 PART_NUMBER_PATTERN = r"([0-9]+)"
 # Part 2 constants
 GEAR_PATTERN = r"(\*)"
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+@traced
 def preprocess_input(input):
-    engine_map = np.array([[c for c in line] for line in input])
-    return engine_map
-
-
-def mark_valid_area(is_part_number_map, r, c):
-    # traverse surrounding rows
-    for i in range(-1, 2):
-        row = r + i
-        if row < 0 or row >= is_part_number_map.shape[0]:
-            # skip wrap-arounds
-            continue
-        # traverse surrounding columns (of the number)
-        for j in range(-1, 2):
-            col = c + j
-            if col < 0 or col >= is_part_number_map.shape[1]:
-                # skip wrap-arounds
-                continue
-            is_part_number_map[row, col] = True
-    return is_part_number_map
+    # the engine map as grid, and its rows as strings to find the numbers in
+    engine_map = input
+    rows = to_lines(engine_map)
+    return engine_map, rows
 
 
-def mark_part_areas(engine_map, is_part_number_map):
-    r = 0
-    for row in engine_map:
-        c = 0
-        for col in row:
-            is_symbol = bool(re.search(SYMBOL_PATTERN, col))
-            if is_symbol:
-                is_part_number_map = mark_valid_area(is_part_number_map, r, c)
-            c += 1
-        r += 1
-
-    return is_part_number_map
+def mark_part_areas(engine_map):
+    # every cell next to (or on) a symbol, i.e. anything but a digit or an empty space
+    is_symbol = ~mask(engine_map, DIGITS + EMPTY_SPACE)
+    return dilate(is_symbol)
 
 
 # Part 1
 def get_part_num_sum(input, engine_map):
     # boolean map for valid part number positions
-    is_part_number_map = np.zeros(engine_map.shape, dtype=bool)
-
-    # mark all areas valid as part numbers
-    is_part_number_map = mark_part_areas(engine_map, is_part_number_map)
+    is_part_number_map = mark_part_areas(engine_map)
     # sum of all engine part numbers
     part_num_sum = 0
     r = 0
-    for row in tqdm(input):
+    for row in track(input):
         for number_match in re.finditer(PART_NUMBER_PATTERN, row):
             c_start, c_end = number_match.span()
             if np.any(is_part_number_map[r, c_start:c_end]):
@@ -127,7 +92,7 @@ def get_gear_ratio_sum(input, engine_map):
     gear_ratio_sum = 0
 
     r = 0
-    for row in tqdm(input):
+    for row in track(input):
         for gear_match in re.finditer(GEAR_PATTERN, row):
             c = gear_match.start()
             # the gear is valid if surrounded by exactly 2 part numbers
@@ -143,22 +108,9 @@ def get_gear_ratio_sum(input, engine_map):
 
 
 def solve(input, part):
-    # NxNx1 string array of the engine map
-    engine_map = preprocess_input(input)
+    # NxN uint8 grid of the engine map
+    engine_map, rows = preprocess_input(input)
     # Part 1: Find the sum of all the valid part numbers
     # Part 2: Find the sum of all gear ratios, i.e. '*'-symbols with exactly 2 neighboring part numbers
-    solution = get_part_num_sum(input, engine_map) if part == 1 else get_gear_ratio_sum(input, engine_map)
+    solution = get_part_num_sum(rows, engine_map) if part == 1 else get_gear_ratio_sum(rows, engine_map)
     return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
@@ -1,43 +1,31 @@
-import sys
-import os
-import numpy as np
+from itertools import chain
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import trange
+from aoc.inputs import STREAM
+from aoc.ints import parse_int_lines
+from aoc.parallel import parallel_map
+from aoc.progress import track_range
+from aoc.trace import traced
 
 DAY = 4
+INPUT_MODE = STREAM
+# about a second of serial work, below that starting the parallel workers costs more than it saves
+MIN_PARALLEL_COMPARISONS = 10 ** 7
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+@traced
 def preprocess_cards(input):
     # set up lists of lists, containing the winning/own numbers
-    winning_numbers = np.empty(len(input), dtype=object)
-    for i in np.ndindex(winning_numbers.shape): winning_numbers[i] = []
-    candidate_numbers = np.empty(len(input), dtype=object)
-    for i in np.ndindex(candidate_numbers.shape): candidate_numbers[i] = []
-
-    i = 0
-    for card in input:
-        card = card.split(': ')[1]
-        card = card.split(' | ')
-        # split numbers on whitespace, then convert to ints
-        # place all winning/own numbers of each card into a sorted list
-        winning_numbers[i] = list(map(lambda x: int(x), card[0].split()))
-        winning_numbers[i].sort()
-        candidate_numbers[i] = list(map(lambda x: int(x), card[1].split()))
-        candidate_numbers[i].sort()
-        i += 1
+    lines = iter(input)
+    first_line = next(lines, None)
+    if first_line is None:
+        return [], []
+    # the number of winning numbers is the same on every card
+    num_winning = len(first_line.split(': ')[1].split(' | ')[0].split())
+    # one row per card: the card number, then its winning and own numbers
+    cards = parse_int_lines(chain([first_line], lines))
+    # place all winning/own numbers of each card into a sorted list
+    winning_numbers = [sorted(card[1:num_winning + 1]) for card in cards]
+    candidate_numbers = [sorted(card[num_winning + 1:]) for card in cards]
     return winning_numbers, candidate_numbers
 
 
@@ -56,13 +44,28 @@ def get_card_num_winners(card_winners, card_candidates):
     return num_winners
 
 
+def count_card_winners(card):
+    card_winners, card_candidates = card
+    return get_card_num_winners(card_winners, card_candidates)
+
+
+def get_comparisons(card):
+    # at most every own number is compared to every winning number
+    card_winners, card_candidates = card
+    return len(card_winners) * len(card_candidates)
+
+
+def get_cards_num_winners(winning_numbers, candidate_numbers):
+    # cards are independent, large inputs are counted in parallel
+    return list(parallel_map(count_card_winners, zip(winning_numbers, candidate_numbers), cost=get_comparisons,
+                             min_cost=MIN_PARALLEL_COMPARISONS))
+
+
 # Part 1
-def get_total_cards_score(winning_numbers, candidate_numbers, num_cards):
+def get_total_cards_score(cards_num_winners, num_cards):
     total_score = 0
-    for i in trange(num_cards):
-        card_winners = winning_numbers[i]
-        card_candidates = candidate_numbers[i]
-        num_winners = get_card_num_winners(card_winners, card_candidates)
+    for i in track_range(num_cards):
+        num_winners = cards_num_winners[i]
         card_score = 2 ** (num_winners - 1) if num_winners > 0 else 0
         total_score += card_score
 
@@ -70,13 +73,11 @@ def get_total_cards_score(winning_numbers, candidate_numbers, num_cards):
 
 
 # Part 2
-def get_num_cards_won(winning_numbers, candidate_numbers, start_num_cards):
+def get_num_cards_won(cards_num_winners, start_num_cards):
     total_cards_won = 0
     card_multiplier = [1] * start_num_cards
-    for i in trange(start_num_cards):
-        card_winners = winning_numbers[i]
-        card_candidates = candidate_numbers[i]
-        num_winners = get_card_num_winners(card_winners, card_candidates)
+    for i in track_range(start_num_cards):
+        num_winners = cards_num_winners[i]
         num_copies = card_multiplier[i]
         # add a copy for each card ahead for every winning number
         for k in range(1, num_winners + 1):
@@ -93,21 +94,9 @@ def solve(input, part):
     winning_numbers, candidate_numbers = preprocess_cards(input)
     assert len(winning_numbers) == len(candidate_numbers)
     num_cards = len(winning_numbers)
+    cards_num_winners = get_cards_num_winners(winning_numbers, candidate_numbers)
     if part == 1:
-        solution = get_total_cards_score(winning_numbers, candidate_numbers, num_cards)
+        solution = get_total_cards_score(cards_num_winners, num_cards)
     else:
-        solution = get_num_cards_won(winning_numbers, candidate_numbers, num_cards)
+        solution = get_num_cards_won(cards_num_winners, num_cards)
     return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
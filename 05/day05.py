@@ -1,56 +1,38 @@
-import sys
-import os
 from math import inf
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm
+from aoc.inputs import BLOCKS
+from aoc.ints import parse_int_lines
+from aoc.progress import track
+from aoc.trace import traced
 
 DAY = 5
+INPUT_MODE = BLOCKS
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+@traced
 def preprocess_input(input):
-    i = 3  # first mapping starts on line 3
-    seeds = [int(x) for x in input[0].split()[1:]]
-    seed2soil, i = parse_mapping_ranges(input[i:], i)
-    soil2fert, i = parse_mapping_ranges(input[i:], i)
-    fert2water, i = parse_mapping_ranges(input[i:], i)
-    water2light, i = parse_mapping_ranges(input[i:], i)
-    light2temp, i = parse_mapping_ranges(input[i:], i)
-    temp2humidity, i = parse_mapping_ranges(input[i:], i)
-    humidity2loc, i = parse_mapping_ranges(input[i:], i)
+    # the input arrives as blocks: the seeds first, then one block per mapping
+    blocks = iter(input)
+    seeds = parse_int_lines(next(blocks)[:1])[0]
+    # skip the header line ('seed-to-soil map:' etc.) of every mapping block
+    seed2soil, soil2fert, fert2water, water2light, light2temp, temp2humidity, humidity2loc = [
+        parse_mapping_ranges(block[1:]) for block in blocks]
 
     return seeds, seed2soil, soil2fert, fert2water, water2light, light2temp, temp2humidity, humidity2loc
 
 
-def parse_mapping_ranges(subinput, i):
+def parse_mapping_ranges(subinput):
     mapping = []
-    for line in subinput:
-        if line.strip() == "":
-            # empty line, current mapping done
-            break
-        dest, src, l = tuple([int(x) for x in line.split()])
+    for dest, src, l in parse_int_lines(subinput):
         mapping_range = {"src_min": src, "src_max": src + l - 1, "dest_min": dest}
         mapping.append(mapping_range)
-        i += 1
 
-    return mapping, i + 2
+    return mapping
 
 
 def get_tmp_min_location(seeds, mappings):
     min_loc = inf
-    for seed in tqdm(seeds, desc="Seeds processed:"):
+    for seed in track(seeds, desc="Seeds processed:"):
         tmp = seed  # value being mapped
         for mapping in mappings:
             for mapping_range in mapping:
@@ -172,16 +154,3 @@ def solve(input, part):
         seed_ranges = parse_seed_ranges(seeds)
         min_loc = get_seed_ranges_min_location(seed_ranges, mappings)
     return min_loc
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
@@ -1,21 +1,17 @@
-import sys
 from functools import reduce
 
-DAY = 7
+from aoc.inputs import STREAM
+from aoc.trace import traced
 
+DAY = 7
+INPUT_MODE = STREAM
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+CARD_TYPES = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+# 'J' means joker in part 2 and is moved to the start (lowest index = lowest value)
+JOKER_CARD_TYPES = ['J', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'Q', 'K', 'A']
 
 
+@traced
 def preprocess_input(input):
     # create instances of CardHand
     hands = []
@@ -32,7 +28,7 @@ class CardHand:
     hand_types = [0, 1, 2, 3, 4, 5, 6]
     #                   high card   one pair     two pair   threekind  full house fourkind fivekind
     hand_types_counts = [[1, 1, 1, 1, 1], [2, 1, 1, 1], [2, 2, 1], [3, 1, 1], [3, 2], [4, 1], [5]]
-    card_types = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
+    card_types = CARD_TYPES
     use_jokers = False
 
     def __init__(self, hand, bid):
@@ -79,12 +75,9 @@ class CardHand:
 
 
 def solve(input, part):
-    if part == 2:
-        # change 'J' to mean joker
-        joker_index = CardHand.card_types.index('J')
-        # move 'J' from current pos in types list to the start (lowest index = lowest value)
-        CardHand.card_types.insert(0, CardHand.card_types.pop(joker_index))
-        CardHand.use_jokers = True
+    # set the card rules on every call, both parts may be solved in the same process
+    CardHand.card_types = JOKER_CARD_TYPES if part == 2 else CARD_TYPES
+    CardHand.use_jokers = part == 2
 
     card_hands = preprocess_input(input)
 
@@ -97,16 +90,3 @@ def solve(input, part):
     # sum up winnings of each hand
     total_winnings = reduce(lambda tw, h: tw + h.get_winnings(), card_hands, 0)
     return total_winnings
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
@@ -1,31 +1,24 @@
-import sys
-import os
 import re
 from math import gcd
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import trange
+from aoc.inputs import STREAM
+from aoc.progress import track_range
+from aoc.trace import traced
 
 DAY = 8
+INPUT_MODE = STREAM
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+@traced
 def preprocess_input(input):
+    input = iter(input)
     # encode direction L=0, R=1 to use as tuple indices
-    directions = [0 if direction == 'L' else 1 for direction in input[0]]
+    directions = [0 if direction == 'L' else 1 for direction in next(input)]
     locations = {}
-    for loc in input[2:]:
+    for loc in input:
+        if loc == "":
+            # empty line between the directions and the network
+            continue
         start = re.search("^(\w+)", loc).group()
         left = re.search("(\w+)(?=, )", loc).group()
         right = re.search("(\w+)(?=\))", loc).group()
@@ -67,7 +60,7 @@ def solve(input, part):
     else:  # Part 2
         starts = get_starts(locations)
         trip_lengths = [0] * len(starts)
-        for i in trange(len(starts)):
+        for i in track_range(len(starts)):
             p = starts[i]
             direction_index = 0
             steps = 0
@@ -86,16 +79,3 @@ def solve(input, part):
         steps = lcm
 
     return steps
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
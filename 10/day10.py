@@ -1,55 +1,44 @@
-import sys
-import os
-from shapely.geometry import Point, Polygon
 import numpy as np
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
+from aoc.grid import ORTHOGONAL_OFFSETS, find, to_lines
+from aoc.inputs import GRID
+from aoc.parts import LazyParts
+from aoc.progress import track
+from aoc.trace import traced
 
 DAY = 10
+INPUT_MODE = GRID
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+def find_start(pipe_grid):
+    start_pos = tuple(find(pipe_grid, 'S')[0].tolist())
+    start_connections = []
+    # connections for the start node ('S') are those of the neighbouring nodes pointing at it,
+    # in the order of a row by row scan
+    y, x = start_pos
+    for dy, dx in sorted(ORTHOGONAL_OFFSETS):
+        n_y = y + dy
+        n_x = x + dx
+        if not (0 <= n_y < pipe_grid.shape[0] and 0 <= n_x < pipe_grid.shape[1]):
+            continue
+        symbol = chr(pipe_grid[n_y, n_x])
+        if (-dy, -dx) in Node.symbol_connections_map.get(symbol, []):
+            start_connections.append((dy, dx))
 
+    return start_pos, start_connections
 
+
+@traced
 def preprocess_input(input):
-    y_max = len(input)
-    x_max = len(input[0])
+    start_pos, start_connections = find_start(input)
+    y_max, x_max = input.shape
     pipe_map = np.ndarray((y_max, x_max), dtype=object)
-    start_pos = (0, 0)
-    start_node = None
-    for y in range(y_max):
-        line = input[y]
+    for y, line in enumerate(to_lines(input)):
         for x in range(x_max):
-            symbol = line[x]
-            node = Node(x, y, symbol)
-            pipe_map[y, x] = node
-            if symbol == 'S':
-                start_pos = (y, x)
-                start_node = node
-
-    # add connections for the start node ('S')
-    for node in pipe_map.flat:
-        y = node.y
-        x = node.x
-        for c in node.connections:
-            c_x = x + c[1]
-            c_y = y + c[0]
-            is_out_of_bounds = c_x >= pipe_map.shape[1] or c_y >= pipe_map.shape[0]
-            if not is_out_of_bounds and pipe_map[c_y, c_x].symbol == start_node.symbol:
-                inv_x = -1 * c[1]
-                inv_y = -1 * c[0]
-                start_node.connections.append((inv_y, inv_x))
+            pipe_map[y, x] = Node(x, y, line[x])
 
+    start_node = pipe_map[start_pos]
+    start_node.connections.extend(start_connections)
     return pipe_map, start_pos
 
 
@@ -82,7 +71,8 @@ class Node:
         self.x = x
         self.y = y
         self.symbol = symbol
-        self.connections = self.symbol_connections_map[symbol]
+        # copy, the connections of the start node are added per input
+        self.connections = list(self.symbol_connections_map[symbol])
         self.steps_from_start = 0
         self.visited = False
 
@@ -157,6 +147,9 @@ def get_loop_nodes_sorted(loop_nodes, pipe_map):
 
 
 def find_nodes_inside_loop(loop_nodes, pipe_map):
+    # shapely is only needed for part 2, import it when it is used
+    from shapely.geometry import Point, Polygon
+
     sorted_loop_nodes = get_loop_nodes_sorted(loop_nodes, pipe_map)
     loop_points = list(map(lambda n: Point(n.x, n.y), sorted_loop_nodes))
     loop_polygon = Polygon(loop_points)
@@ -166,7 +159,7 @@ def find_nodes_inside_loop(loop_nodes, pipe_map):
 
     # Check each node if it is inside our outside the polygon formed
     # by the nodes of the loop
-    for node in tqdm(pipe_map.flat, desc="Determining nodes inside loop"):
+    for node in track(pipe_map.flat, desc="Determining nodes inside loop"):
         if node in nodes_of_loop:
             continue
         p = Point(node.x, node.y)
@@ -176,28 +169,29 @@ def find_nodes_inside_loop(loop_nodes, pipe_map):
     return nodes_inside_loop
 
 
-def solve(input, part):
+# Part 1 and 2 share the loop
+def find_loop(input):
     pipe_map, start_pos = preprocess_input(input)
     loop_nodes = get_loop_nodes(pipe_map, start_pos)
+    return pipe_map, loop_nodes
+
+
+@traced
+def solve_part1(loop):
+    pipe_map, loop_nodes = loop
+    return get_max_steps(loop_nodes)
 
-    # Part 1
-    max_steps = get_max_steps(loop_nodes)
-    # Part 2
+
+@traced
+def solve_part2(loop):
+    pipe_map, loop_nodes = loop
     enclosed_nodes = find_nodes_inside_loop(loop_nodes, pipe_map)
-    num_enclosed_nodes = len(enclosed_nodes)
-
-    solution = max_steps if part == 1 else num_enclosed_nodes
-    return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
+    return len(enclosed_nodes)
+
+
+def solve_parts(input):
+    return LazyParts(lambda: find_loop(input), {1: solve_part1, 2: solve_part2})
+
+
+def solve(input, part):
+    return solve_parts(input)[part]
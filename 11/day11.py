@@ -1,67 +1,22 @@
-import sys
-import os
 import numpy as np
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
+from aoc.grid import find, mask
+from aoc.inputs import GRID
+from aoc.parts import LazyParts
+from aoc.trace import traced
 
 DAY = 11
+INPUT_MODE = GRID
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+def get_spacing(is_empty, spacing):
+    # `spacing` for every row/column with no galaxies, 1 for the others
+    return np.where(is_empty, spacing, 1)
 
 
-# Part 1
-def preprocess_input(input):
-    y_length = len(input)
-    x_length = len(input[0])
-    space_map = np.ndarray((y_length, x_length), dtype=object)
-    for y in range(y_length):
-        line = input[y]
-        for x in range(x_length):
-            space_map[y, x] = line[x]
-
-    # double up every row with no galaxies
-    new_y = y_length
-    y = 0
-    while y < new_y:
-        row = space_map[y, :]
-        has_no_galaxies = np.all(list(map(lambda p: 0 if p == '#' else 1, row)))
-        if has_no_galaxies:
-            new_y += 1
-            space_map = np.insert(space_map, y, values=row.copy(), axis=0).reshape(new_y, x_length)
-            y += 2
-        else:
-            y += 1
-
-    # double up every column with no galaxies
-    new_x = x_length
-    x = 0
-    while x < new_x:
-        column = space_map[:, x]
-        has_no_galaxies = np.all(list(map(lambda p: 0 if p == '#' else 1, column)))
-        if has_no_galaxies:
-            new_x += 1
-            space_map = np.insert(space_map, x, values=column.copy(), axis=1).reshape(new_y, new_x)
-            x += 2
-        else:
-            x += 1
-
+def get_galaxies(space_map):
     # get locations of galaxies
-    galaxy_locs = []
-    for y in range(new_y):
-        for x in range(new_x):
-            if space_map[y, x] == '#':
-                galaxy_locs.append((y, x))
+    galaxy_locs = [tuple(loc) for loc in find(space_map, '#').tolist()]
     num_galaxies = len(galaxy_locs)
 
     # create pairs of galaxies
@@ -71,60 +26,26 @@ def preprocess_input(input):
     for i in range(num_galaxies):
         for j in range(i + 1, num_galaxies):
             galaxy_pairs.append((i, j))
+    return galaxy_locs, galaxy_pairs
 
-    return space_map, galaxy_locs, galaxy_pairs
-
-
-# Part 2
-def preprocess_input_part2(input):
-    y_length = len(input)
-    x_length = len(input[0])
-    space_map = np.ndarray((y_length, x_length), dtype=object)
-    for y in range(y_length):
-        line = input[y]
-        for x in range(x_length):
-            space_map[y, x] = line[x]
-
-    # each non-galaxy row/column should count as 1 000 000 empty ones
-    extra_spacing = 10 ** 6
 
-    # add extra spacing for every row with no galaxies
-    row_spacing = np.ones((y_length), dtype=int)
-    y = 0
-    while y < y_length:
-        row = space_map[y, :]
-        has_no_galaxies = np.all(list(map(lambda p: 0 if p == '#' else 1, row)))
-        if has_no_galaxies:
-            row_spacing[y] = extra_spacing
-        y += 1
-
-    # add extra spacing for every column with no galaxies
-    x = 0
-    column_spacing = np.ones(x_length, dtype=int)
-    while x < x_length:
-        column = space_map[:, x]
-        has_no_galaxies = np.all(list(map(lambda p: 0 if p == '#' else 1, column)))
-        if has_no_galaxies:
-            column_spacing[x] = extra_spacing
-        x += 1
+# Part 1 and 2 share the galaxies and the rows/columns without any
+@traced
+def preprocess_input(input):
+    space_map = input
+    galaxy_locs, galaxy_pairs = get_galaxies(space_map)
+    galaxies = mask(space_map, '#')
+    empty_rows = ~galaxies.any(axis=1)
+    empty_columns = ~galaxies.any(axis=0)
+    return space_map, galaxy_locs, galaxy_pairs, empty_rows, empty_columns
 
-    # get locations of galaxies
-    galaxy_locs = []
-    for y in range(y_length):
-        for x in range(x_length):
-            if space_map[y, x] == '#':
-                galaxy_locs.append((y, x))
-    num_galaxies = len(galaxy_locs)
 
-    # create pairs of galaxies
-    # i = current galaxy g1
-    # j = current galaxy g2
-    galaxy_pairs = []
-    for i in range(num_galaxies):
-        for j in range(i + 1, num_galaxies):
-            galaxy_pairs.append((i, j))
-
-    return space_map, galaxy_locs, galaxy_pairs, row_spacing, column_spacing
+# Part 1
+def expand_galaxy_locs(galaxy_locs, row_spacing, column_spacing):
+    # the locations of the galaxies once every row/column is as wide as its spacing
+    row_starts = np.cumsum(row_spacing) - row_spacing
+    column_starts = np.cumsum(column_spacing) - column_spacing
+    return [(int(row_starts[y]), int(column_starts[x])) for y, x in galaxy_locs]
 
 
 # Part 1
@@ -158,27 +79,31 @@ def get_shortest_galaxy_pair_path_part2(g1_loc, g2_loc, row_spacing, column_spac
     return shortest_pair_path
 
 
+@traced
+def solve_part1(universe):
+    space_map, galaxy_locs, galaxy_pairs, empty_rows, empty_columns = universe
+    # double up every row and column with no galaxies
+    row_spacing = get_spacing(empty_rows, 2)
+    column_spacing = get_spacing(empty_columns, 2)
+    expanded_galaxy_locs = expand_galaxy_locs(galaxy_locs, row_spacing, column_spacing)
+    galaxy_paths = get_shortest_galaxy_paths(expanded_galaxy_locs, galaxy_pairs)
+    return np.sum(galaxy_paths)
+
+
+@traced
+def solve_part2(universe):
+    space_map, galaxy_locs, galaxy_pairs, empty_rows, empty_columns = universe
+    # each non-galaxy row/column should count as 1 000 000 empty ones
+    extra_spacing = 10 ** 6
+    row_spacing = get_spacing(empty_rows, extra_spacing)
+    column_spacing = get_spacing(empty_columns, extra_spacing)
+    galaxy_paths = get_shortest_galaxy_paths(galaxy_locs, galaxy_pairs, row_spacing, column_spacing)
+    return np.sum(galaxy_paths)
+
+
+def solve_parts(input):
+    return LazyParts(lambda: preprocess_input(input), {1: solve_part1, 2: solve_part2})
+
+
 def solve(input, part):
-    galaxy_paths = []
-    if part == 1:
-        space_map, galaxy_locs, galaxy_pairs = preprocess_input(input)
-        galaxy_paths = get_shortest_galaxy_paths(galaxy_locs, galaxy_pairs)
-    if part == 2:
-        space_map, galaxy_locs, galaxy_pairs, row_spacing, column_spacing = preprocess_input_part2(input)
-        galaxy_paths = get_shortest_galaxy_paths(galaxy_locs, galaxy_pairs, row_spacing, column_spacing)
-
-    solution = np.sum(galaxy_paths)
-    return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
+    return solve_parts(input)[part]
@@ -1,34 +1,26 @@
-import sys
-import os
 import re
 from itertools import chain
-from functools import lru_cache
-from multiprocessing import Pool
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
+from aoc.inputs import STREAM
+from aoc.memo import memoize
+from aoc.parallel import parallel_map
+from aoc.parts import LazyParts
+from aoc.progress import track_range
+from aoc.trace import traced
 
 DAY = 12
+INPUT_MODE = STREAM
 DAMAGED_SPRING = '#'
 OPERATIONAL_SPRING = '.'
 UNKNOWN_SPRING = '?'
 OPEN_BRACE_CHAR = '{'
 CLOSE_BRACE_CHAR = '}'
+# fewer combinations (about a second of serial work) are checked faster than a worker pool starts
+MIN_PARALLEL_COMBINATIONS = 2 ** 19
 pattern_memo = {}
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+@traced
 def preprocess_input(input):
     spring_rows = []
     damaged_counts = []
@@ -104,19 +96,21 @@ def get_num_valid_combinations_row(combinations, row_damaged_counts):
 
 
 # Part 1
-def calculate_num_valid_arrangements_parallel_brute(worker_id, num_workers, spring_rows, damaged_counts):
-    partial_num_valid_combinations = 0
-    for i in range(worker_id, len(spring_rows), num_workers):
-        row = spring_rows[i]
-        counts = damaged_counts[i]
-        possible_combinations = list(get_all_possible_combinations(row, 0, "", counts, 0))
-        partial_num_valid_combinations += get_num_valid_combinations_row(possible_combinations, counts)
-    return partial_num_valid_combinations
+def get_num_valid_arrangements_brute(record):
+    row, counts = record
+    possible_combinations = list(get_all_possible_combinations(row, 0, "", counts, 0))
+    return get_num_valid_combinations_row(possible_combinations, counts)
+
+
+def get_brute_force_cost(record):
+    # every unknown spring doubles the combinations to check
+    return 2 ** record[0].count(UNKNOWN_SPRING)
 
 
 # Part 2
-# limit cache use to 1000 function calls - larger caches takes longer to confirm hits/misses
-@lru_cache(maxsize=1000)
+# limit cache use to 1000 function calls - hits come almost only from the same row, larger caches
+# (up to unbounded) add about 1% hits but take longer (see --cache-stats)
+@memoize(maxsize=1000)
 def get_num_valid_combinations_row_cache(remaining_row, counts):
     num_valid = 0
 
@@ -191,7 +185,7 @@ def get_num_valid_combinations_row_cache(remaining_row, counts):
 
 def get_num_valid_arrangements_cache(spring_rows, damaged_counts):
     num_valid_combinations = 0
-    for i in trange(len(spring_rows)):
+    for i in track_range(len(spring_rows)):
         row = spring_rows[i]
         counts = damaged_counts[i]
         num_valid_combinations += get_num_valid_combinations_row_cache(row, counts)
@@ -200,47 +194,42 @@ def get_num_valid_arrangements_cache(spring_rows, damaged_counts):
 
 
 def get_num_valid_combinations(spring_rows, damaged_counts, part):
-    num_workers = 8
-    with Pool(processes=num_workers) as pool:
-        args = []
-        for i in range(num_workers):
-            args.append((i, num_workers, spring_rows, damaged_counts))
-        # split the workload into `num_workers` pieces
-        # each worker reads different rows from the input and calculates their partial sum
-        if part == 1:
-            results = pool.starmap(calculate_num_valid_arrangements_parallel_brute, args)
-        else:  # Part 2
-            results = get_num_valid_arrangements_cache(spring_rows, damaged_counts)
+    if part == 1:
+        # only the brute force of part 1 runs in parallel, the rows are split by their number of combinations
+        records = list(zip(spring_rows, damaged_counts))
+        results = parallel_map(get_num_valid_arrangements_brute, records, cost=get_brute_force_cost,
+                               min_cost=MIN_PARALLEL_COMBINATIONS)
+    else:  # Part 2
+        results = get_num_valid_arrangements_cache(spring_rows, damaged_counts)
     sum_num_valid_combinations = sum(results)
     return sum_num_valid_combinations
 
 
 # Part 2
 def unfold_input(spring_rows, damaged_counts, multiplier=5):
-    for i in range(len(spring_rows)):
-        spring_rows[i] = '?'.join([spring_rows[i]] * multiplier)
-        damaged_counts[i] = damaged_counts[i] * multiplier
+    # new lists, the folded rows are shared with part 1
+    spring_rows = ['?'.join([row] * multiplier) for row in spring_rows]
+    damaged_counts = [counts * multiplier for counts in damaged_counts]
     return spring_rows, damaged_counts
 
 
-def solve(input, part):
-    spring_rows, damaged_counts = preprocess_input(input)
-    if part == 2:
-        spring_rows, damaged_counts = unfold_input(spring_rows, damaged_counts)
+@traced
+def solve_part1(records):
+    spring_rows, damaged_counts = records
     # get the sum of the number of all valid arrangements for every row
-    solution = get_num_valid_combinations(spring_rows, damaged_counts, part)
-
-    return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
+    return get_num_valid_combinations(spring_rows, damaged_counts, 1)
+
+
+@traced
+def solve_part2(records):
+    spring_rows, damaged_counts = unfold_input(*records)
+    return get_num_valid_combinations(spring_rows, damaged_counts, 2)
+
+
+def solve_parts(input):
+    # the input is streamed, so it is parsed once for both parts
+    return LazyParts(lambda: preprocess_input(input), {1: solve_part1, 2: solve_part2})
+
+
+def solve(input, part):
+    return solve_parts(input)[part]
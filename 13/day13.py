@@ -1,75 +1,43 @@
-import sys
-import os
+from functools import partial
 
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
+from aoc.grid import from_lines, transpose
+from aoc.inputs import BLOCKS
+from aoc.parallel import parallel_map
+from aoc.preprocessed import cached_preprocess
+from aoc.trace import traced
 
 DAY = 13
+INPUT_MODE = BLOCKS
 
 ASCII_OFFSET = 32
 ROW_FACTOR = 100
 COL_FACTOR = 1
 ENCODE_BASE = 16
+# patterns with fewer cells in total (about a second of serial work) are searched faster than a worker
+# pool starts, by part: part 2 compares far more per cell
+MIN_PARALLEL_CELLS = {1: 10 ** 7, 2: 2 * 10 ** 5}
+# the base16 digit of each character after the offset, e.g. '.' (46 - 32 = 14) -> 'e'
+HEX_DIGITS = bytes.maketrans(bytes(range(ASCII_OFFSET, ASCII_OFFSET + ENCODE_BASE)), b'0123456789abcdef')
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+def encode_vectors(vectors):
+    # encode every row of a grid as a sum based on its ASCII representation:
+    # each character, offset to get a smaller base, times 16 to the power of its index,
+    # i.e. the row read backwards as a base16 number
+    return [int(vector[::-1].tobytes().translate(HEX_DIGITS), ENCODE_BASE) for vector in vectors]
 
 
+@traced
+@cached_preprocess
 def preprocess_input(input):
-    num_patterns = 1
-    for i in range(len(input)):
-        if input[i] == "":
-            num_patterns += 1
-    patterns_rows = [[] for _ in range(num_patterns)]
-    patterns_columns = [[] for _ in range(num_patterns)]
-    p = 0
     # add all patterns in separate lists
-    # each pattern represented by a list of strings (rows)
-    for i in range(len(input)):
-        if input[i] == "":
-            p += 1
-            continue
-        patterns_rows[p].append(input[i])
-    # add all patterns read vertically in separate lists
-    # each pattern represented by a list of strings (columns)
-    for p in range(num_patterns):
-        assert len(max(patterns_rows[p])) == len(min(patterns_rows[p]))
-        pattern_width = len(patterns_rows[p][0])
-        pattern_height = len(patterns_rows[p])
-        patterns_columns[p] = ['' for _ in range(pattern_width)]
-        for j in range(pattern_width):
-            for i in range(pattern_height):
-                patterns_columns[p][j] += patterns_rows[p][i][j]
-
-    for p in range(num_patterns):
-        pattern_width = len(patterns_columns[p])
-        pattern_height = len(patterns_rows[p])
-        # for every row, encode it as a sum based on its ASCII representation
-        for y in range(pattern_height):
-            pattern_row = patterns_rows[p][y]
-            patterns_rows[p][y] = 0
-            # convert each character to an ASCII int and add to the row sum
-            # offset ASCII values to get a smaller base
-            # use column index x as exponent of 16 for base16-encoded columns
-            for x in range(pattern_width):
-                patterns_rows[p][y] += (ord(pattern_row[x]) - ASCII_OFFSET) * ENCODE_BASE ** x
-
-        # for every column, encode it as a sum based on its ASCII representation
-        for x in range(pattern_width):
-            pattern_col = patterns_columns[p][x]
-            patterns_columns[p][x] = 0
-            # convert each character to an ASCII int and add to the column sum
-            for y in range(pattern_height):
-                patterns_columns[p][x] += (ord(pattern_col[y]) - ASCII_OFFSET) * ENCODE_BASE ** y
+    # each pattern represented by a list of its encoded rows, and one of its encoded columns
+    patterns_rows = []
+    patterns_columns = []
+    for block in input:
+        pattern = from_lines(block)
+        patterns_rows.append(encode_vectors(pattern))
+        patterns_columns.append(encode_vectors(transpose(pattern)))
 
     return patterns_rows, patterns_columns
 
@@ -126,40 +94,31 @@ def get_pattern_reflections(pattern_axis, part, transposed_length):
     return reflection_skips
 
 
-def get_reflection_values(patterns_rows, patterns_columns, part):
-    assert len(patterns_rows) == len(patterns_columns)
-    num_patterns = len(patterns_rows)
-    reflection_values = [0] * num_patterns
+def get_reflection_value(pattern, part):
+    pattern_rows, pattern_columns = pattern
+    row_length = len(pattern_columns)  # rows are as long as there are number of columns
+    col_length = len(pattern_rows)  # columns are as long as there are number of rows
+    reflection_rows = get_pattern_reflections(pattern_rows, part, row_length)
+    reflection_cols = get_pattern_reflections(pattern_columns, part, col_length)
+    return reflection_rows * ROW_FACTOR + reflection_cols * COL_FACTOR
+
+
+def get_pattern_size(pattern):
+    pattern_rows, pattern_columns = pattern
+    return len(pattern_rows) * len(pattern_columns)
 
-    for p in range(num_patterns):
-        pattern_columns = patterns_columns[p]
-        pattern_rows = patterns_rows[p]
-        row_length = len(pattern_columns)  # rows are as long as there are number of columns
-        col_length = len(pattern_rows)  # columns are as long as there are number of rows
-        reflection_rows = get_pattern_reflections(pattern_rows, part, row_length)
-        reflection_cols = get_pattern_reflections(pattern_columns, part, col_length)
-        reflection_values[p] = reflection_rows * ROW_FACTOR + reflection_cols * COL_FACTOR
 
-    return reflection_values
+def get_reflection_values(patterns_rows, patterns_columns, part):
+    assert len(patterns_rows) == len(patterns_columns)
+    # patterns are independent, large inputs are searched in parallel, split by the patterns' sizes
+    patterns = zip(patterns_rows, patterns_columns)
+    return list(parallel_map(partial(get_reflection_value, part=part), patterns, cost=get_pattern_size,
+                             min_cost=MIN_PARALLEL_CELLS[part]))
 
 
 def solve(input, part):
     patterns_rows, patterns_columns = preprocess_input(input)
     reflection_values = get_reflection_values(patterns_rows, patterns_columns, part)
-    print(reflection_values)
     reflection_sum = sum(reflection_values)
 
     return reflection_sum
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
@@ -1,51 +1,29 @@
-import sys
-import os
 import numpy as np
-from functools import reduce
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
 
-DAY = 14
-
-EMPTY_SPACE = b'.'
-ROUND_ROCK = b'O'
+from aoc.grid import mask
+from aoc.inputs import GRID
+from aoc.memo import TrackedDict
+from aoc.trace import traced
 
+DAY = 14
+INPUT_MODE = GRID
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
+EMPTY_SPACE = ord('.')
+ROUND_ROCK = ord('O')
 
 
+@traced
 def preprocess_input(input):
-    # create a map that keeps track of what exists at each spot in the map
-    y_max = len(input)
-    x_max = len(max(input, key=lambda r: len(r)))
-    row_map = np.zeros((y_max, x_max), dtype='S1')
-    for y in range(y_max):
-        row_map[y, :] = list(input[y])
+    # the map of what exists at each spot, copied as the rocks are moved in place
+    row_map = np.array(input, dtype=np.uint8)
     return row_map
 
 
 def get_total_load(row_map):
-    total_load = 0
-    for y in range(len(row_map)):
-        row = row_map[y]
-        row_magnitude = len(row_map) - y
-        rock_row_count = 0
-        # count the rocks in the row
-        for x in range(len(row)):
-            if row[x] == ROUND_ROCK:
-                rock_row_count += 1
-
-        row_load = row_magnitude * rock_row_count
-        total_load += row_load
+    # each rock weighs as much as its row's distance from the southern edge
+    rock_row_counts = mask(row_map, 'O').sum(axis=1)
+    row_magnitudes = np.arange(len(row_map), 0, -1)
+    total_load = int(np.dot(rock_row_counts, row_magnitudes))
     return total_load
 
 
@@ -124,21 +102,12 @@ def tilt_east(row_map):
 
 
 def get_cache_key(row_map):
-    return reduce(lambda t, c: t + c, row_map.flat)
+    return row_map.tobytes()
 
 
 def cache_key_to_row_map(cache_key, shape):
-    row_map = np.zeros(shape, dtype='S1')
-    y_max = shape[0]
-    x_max = shape[1]
-    # split the byte-array from cache into rows
-    for y in range(y_max):
-        start = x_max*y
-        end = start+x_max
-        row = cache_key[start:end]
-        if len(row) == 0:
-            break
-        row_map[y, :] = list(row.decode())
+    # the byte-array from cache holds the rows one after another
+    row_map = np.frombuffer(cache_key, dtype=np.uint8).reshape(shape).copy()
     return row_map
 
 
@@ -149,7 +118,7 @@ def solve(input, part):
     else:
         # Part 2
         num_cycles = 10**9
-        cycle_cache = dict()
+        cycle_cache = TrackedDict(f'{__name__}.cycle_cache')
         c = 0
         while c < num_cycles:
             cache_key = get_cache_key(row_map)
@@ -170,27 +139,10 @@ def solve(input, part):
             tilt_west(row_map)
             tilt_south(row_map)
             tilt_east(row_map)
-            # save this cycle's state to cache
-            if cache_key not in cycle_cache:
-                cycle_cache[cache_key] = dict()
-            cycle_cache[cache_key]['c'] = c
-            # save the state of the map after the cycle
-            cycle_cache[cache_key]['row_map'] = get_cache_key(row_map)
+            # save this cycle's state to cache, together with the state of the map after the cycle
+            cycle_cache[cache_key] = {'c': c, 'row_map': get_cache_key(row_map)}
             c += 1
 
     # calculate the load on the northern support beams after all tilting is completed
     load = get_total_load(row_map)
     return load
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
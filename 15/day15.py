@@ -1,8 +1,7 @@
-import sys
-import os
 import re
-os.environ["TQDM_COLOUR"] = "#33ffaa"
-from tqdm import tqdm, trange
+
+from aoc.parts import LazyParts
+from aoc.trace import traced
 
 DAY = 15
 
@@ -17,25 +16,15 @@ FOCAL_LENGTH_KEY = 'focal_length'
 ORDER_KEY = 'order'
 
 
-def read_input(part, use_example_input=False):
-    global DAY
-    if DAY < 10:
-        DAY = "0" + str(DAY)
-    example_filename = "example_input.txt" if part == 1 else "example_input2.txt"
-    filename = example_filename if use_example_input else f'input{DAY}.txt'
-    file = open(filename, mode='r')
-    lines = file.read().splitlines()
-    file.close()
-    return lines
-
-
+# Part 1 and 2 share the sequence
+@traced
 def preprocess_input(input):
     sequence = input[0].split(',')
     return sequence
 
 
-def preprocess_input_part2(input):
-    sequence = input[0].split(',')
+# Part 2
+def parse_steps(sequence):
     steps = [dict() for _ in range(len(sequence))]
     boxes = [dict() for _ in range(NUM_BOXES)]
     for i, subsequence in enumerate(sequence):
@@ -110,31 +99,27 @@ def calc_focusing_power(boxes):
     return focusing_power
 
 
+@traced
+def solve_part1(sequence):
+    hash_results = calc_sequence_hashes(sequence)
+    verification_sum = sum(hash_results)
+    return verification_sum
+
+
+@traced
+def solve_part2(sequence):
+    steps, boxes = parse_steps(sequence)
+    step_labels = list(map(lambda step: step[LABEL_KEY], steps))
+    label_hashes = calc_sequence_hashes(step_labels)
+    add_box_numbers(steps, label_hashes)
+    set_boxes_lens_config(steps, boxes)
+    focusing_power = calc_focusing_power(boxes)
+    return focusing_power
+
+
+def solve_parts(input):
+    return LazyParts(lambda: preprocess_input(input), {1: solve_part1, 2: solve_part2})
+
+
 def solve(input, part):
-    if part == 1:
-        sequence = preprocess_input(input)
-        hash_results = calc_sequence_hashes(sequence)
-        verification_sum = sum(hash_results)
-        solution = verification_sum
-    else:
-        steps, boxes = preprocess_input_part2(input)
-        step_labels = list(map(lambda step: step[LABEL_KEY], steps))
-        label_hashes = calc_sequence_hashes(step_labels)
-        add_box_numbers(steps, label_hashes)
-        set_boxes_lens_config(steps, boxes)
-        focusing_power = calc_focusing_power(boxes)
-        solution = focusing_power
-    return solution
-
-
-if __name__ == "__main__":
-    part = 1
-    use_example_input = False
-    if len(sys.argv) > 1:
-        part = int(sys.argv[1])
-        if len(sys.argv) > 2:
-            use_example_input = not int(sys.argv[2]) == 0
-    input = read_input(part, use_example_input)
-    solution = solve(input, part)
-    print('Solution:')
-    print(solution)
+    return solve_parts(input)[part]
@@ -0,0 +1,10 @@
+# the entry points are imported on first use, so that light modules of the package (e.g. the
+# daemon's client) start without importing the runner
+def __getattr__(name):
+    if name in ('get_day', 'get_days'):
+        from aoc import registry
+        return getattr(registry, name)
+    if name == 'run':
+        from aoc import runner
+        return runner.run
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,141 @@
+import os
+import sys
+import csv
+import glob
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc import preprocessed, progress
+from aoc.parallel import available_cpus
+from aoc.registry import get_days
+from aoc.result_cache import to_json_value
+from aoc.runner import PARTS, init_worker, run
+
+INPUT_SUFFIX = '.txt'
+CSV_COLUMNS = ['day', 'part', 'input', 'solution', 'duration_ms', 'cached', 'error']
+# several inputs per task keep the workers busy without one task per tiny input
+CHUNKS_PER_WORKER = 4
+
+
+def find_inputs(patterns):
+    # each pattern is a directory (all *.txt files in it), a glob or a single file
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, f'*{INPUT_SUFFIX}'))))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(p for p in glob.glob(pattern) if os.path.isfile(p)))
+        elif os.path.isfile(pattern):
+            paths.append(pattern)
+        else:
+            raise FileNotFoundError(f'no input file or directory {pattern!r}')
+    # the same file given twice is solved once
+    return list(dict.fromkeys(paths))
+
+
+def get_jobs(day_number, parts, paths):
+    return [(day_number, part, path) for path in paths for part in parts]
+
+
+def run_job(job, use_cache=False, memory_limit=None):
+    day_number, part, path = job
+    return run(day_number, part, use_cache=use_cache, path=path, memory_limit=memory_limit)
+
+
+def run_batch(jobs, num_workers=1, use_cache=False, memory_limit=None):
+    # results are yielded in job order
+    if num_workers <= 1:
+        for job in jobs:
+            yield run_job(job, use_cache, memory_limit)
+        return
+    chunksize = max(1, len(jobs) // (num_workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                             initargs=(False, use_cache)) as executor:
+        yield from executor.map(partial(run_job, use_cache=use_cache, memory_limit=memory_limit), jobs, chunksize=chunksize)
+
+
+def get_rows(results):
+    rows = []
+    for r in results:
+        # the last line of the traceback names the exception
+        error = r.error.strip().splitlines()[-1] if r.error else ''
+        rows.append({'day': r.day, 'part': r.part, 'input': r.path, 'solution': to_json_value(r.solution),
+                     'duration_ms': round(r.duration * 1000, 3), 'cached': r.cached, 'error': error})
+    return rows
+
+
+def format_table(rows):
+    width = max([len('input')] + [len(r['input']) for r in rows])
+    header = f'{"input":<{width}} {"part":>4} {"solution":>20} {"ms":>10}'
+    lines = [header]
+    for r in rows:
+        if r['error']:
+            solution = 'FAILED'
+        else:
+            solution = str(r['solution'])
+        cached = ' (cached)' if r['cached'] else ''
+        lines.append(f'{r["input"]:<{width}} {r["part"]:>4} {solution:>20} {r["duration_ms"]:>10.1f}{cached}')
+    failed = [r for r in rows if r['error']]
+    lines.append(f'{len(rows) - len(failed)} solved, {len(failed)} failed')
+    for r in failed:
+        lines.append(f'{r["input"]} part {r["part"]}: {r["error"]}')
+    return '\n'.join(lines)
+
+
+def write_csv(rows, file):
+    writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc.batch', description='Solve many input files of one day in one run')
+    parser.add_argument('day', type=int, help='day whose solver is used')
+    parser.add_argument('inputs', nargs='+', help='input files, directories (all *.txt files) or globs')
+    parser.add_argument('-p', '--parts', nargs='+', type=int, choices=PARTS, default=PARTS,
+                        help='parts to run (default: both)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of inputs to solve concurrently, 0 = one per available CPU (default: 1)')
+    parser.add_argument('--no-cache', action='store_true', help='always solve, ignoring cached answers')
+    parser.add_argument('--memory-limit', type=float, metavar='MIB', help='fail an input whose RSS exceeds this many MiB')
+    parser.add_argument('-o', '--output', help='write the results as CSV to this file ("-" for stdout)')
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error('--jobs must not be negative')
+    if args.memory_limit is not None and args.memory_limit <= 0:
+        parser.error('--memory-limit must be positive')
+    available_days = get_days()
+    if args.day not in available_days:
+        parser.error(f'no solver for day {args.day}, available: {sorted(available_days)}')
+    try:
+        args.paths = find_inputs(args.inputs)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not args.paths:
+        parser.error(f'no inputs match {args.inputs}')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    # hundreds of progress bars would bury the results
+    progress.set_enabled(False)
+    use_cache = not args.no_cache
+    preprocessed.set_enabled(use_cache)
+    jobs = get_jobs(args.day, args.parts, args.paths)
+    num_workers = min(args.jobs if args.jobs > 0 else available_cpus(), len(jobs))
+    memory_limit = args.memory_limit * 2 ** 20 if args.memory_limit is not None else None
+    rows = get_rows(run_batch(jobs, num_workers, use_cache, memory_limit))
+    if args.output == '-':
+        write_csv(rows, sys.stdout)
+    else:
+        print(format_table(rows))
+        if args.output:
+            with open(args.output, mode='w', newline='') as file:
+                write_csv(rows, file)
+    return 0 if all(not r['error'] for r in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tracemalloc
+
+from aoc import preprocessed, progress
+from aoc.complexity import MIN_SIZES, fit_results, format_fits
+from aoc.history import append_history
+from aoc.inputs import BYTES, GRID, read_lines
+from aoc.registry import get_day, get_days
+from aoc.result_cache import to_json_value
+from aoc.generators import can_scale, write_generated_input, write_scaled_input
+
+PARTS = [1, 2]
+PHASES = ['parse', 'preprocess', 'solve']
+DEFAULT_REPEATS = 5
+DEFAULT_SCALES = [1, 4]
+
+
+def percentile(sorted_values, p):
+    # nearest-rank percentile, well defined for any number of repetitions
+    if len(sorted_values) == 0:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarise(durations):
+    durations = sorted(durations)
+    if len(durations) == 0:
+        return None
+    return {
+        'min': durations[0],
+        'median': percentile(durations, 50),
+        'p95': percentile(durations, 95),
+        'runs': len(durations),
+    }
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def measure_peak_memory(day, part, path):
+    day.reset_caches()
+    tracemalloc.start()
+    try:
+        day.solve(day.load_input(part, path=path), part)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def read_whole_input(day, part, path):
+    # streamed inputs are lazy and memory-mapped grids and buffers are only read when accessed,
+    # all are read completely here so that parsing can be timed on its own
+    input = day.load_input(part, path=path)
+    if day.input_mode(part) == GRID:
+        return input.copy()
+    if day.input_mode(part) == BYTES:
+        return bytes(input)
+    return list(input)
+
+
+def bench_case(day, part, path, repeats):
+    timings = {phase: [] for phase in PHASES}
+    preprocess = day.get_preprocessor(part)
+    solution = None
+    for _ in range(repeats):
+        # every repetition starts cold, memoised results of earlier runs are dropped
+        day.reset_caches()
+        _, duration = time_call(read_whole_input, day, part, path)
+        timings['parse'].append(duration)
+        if preprocess is not None:
+            # preprocessors may consume their input, give them their own copy
+            input = read_whole_input(day, part, path)
+            _, duration = time_call(preprocess, input)
+            timings['preprocess'].append(duration)
+        # solve is timed end to end, i.e. including streaming and the day's own preprocessing
+        input = day.load_input(part, path=path)
+        solution, duration = time_call(day.solve, input, part)
+        timings['solve'].append(duration)
+
+    return {
+        'day': day.number,
+        'part': part,
+        'input': os.path.basename(path),
+        'lines': len(read_lines(path)),
+        'solution': to_json_value(solution),
+        'phases': {phase: summarise(timings[phase]) for phase in PHASES},
+        'peak_memory': measure_peak_memory(day, part, path),
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+def get_input_paths(day, scales, sizes, seed):
+    # (label, input description, path) for the shipped input, its scaled copies and generated inputs
+    paths = []
+    for scale in scales:
+        if scale == 1:
+            paths.append((f'x{scale}', {'scale': scale}, day.input_path(1)))
+        elif can_scale(day.number):
+            paths.append((f'x{scale}', {'scale': scale}, write_scaled_input(day, scale)))
+    for size in sizes:
+        paths.append((f'n{size}', {'size': size, 'seed': seed}, write_generated_input(day, size, seed)))
+    return paths
+
+
+def run_benchmarks(day_numbers, parts, scales, repeats, sizes=(), seed=0, log=None):
+    results = []
+    for day_number in day_numbers:
+        day = get_day(day_number)
+        for label, description, path in get_input_paths(day, scales, sizes, seed):
+            for part in parts:
+                if log is not None:
+                    print(f'Day {day.name} part {part} {label} ...', file=log, flush=True)
+                case = bench_case(day, part, path, repeats)
+                case['label'] = label
+                case.update(description)
+                results.append(case)
+    return results
+
+
+def get_metadata(repeats, scales, sizes, seed):
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'scales': scales,
+        'sizes': sizes,
+        'seed': seed,
+    }
+
+
+def format_table(results):
+    header = f'{"day":>3} {"part":>4} {"input":>6} {"lines":>7} ' + \
+             ' '.join(f'{phase + " med ms":>16}' for phase in PHASES) + f' {"solve p95 ms":>13} {"peak MiB":>9}'
+    rows = [header]
+    for r in results:
+        medians = []
+        for phase in PHASES:
+            summary = r['phases'][phase]
+            medians.append(f'{summary["median"] * 1000:>16.2f}' if summary else f'{"-":>16}')
+        rows.append(f'{r["day"]:>3} {r["part"]:>4} {r["label"]:>6} {r["lines"]:>7} ' + ' '.join(medians) +
+                    f' {r["phases"]["solve"]["p95"] * 1000:>13.2f} {r["peak_memory"] / 2 ** 20:>9.2f}')
+    return '\n'.join(rows)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc.bench', description='Benchmark the day solvers')
+    parser.add_argument('days', nargs='*', type=int, help='days to benchmark (default: all)')
+    parser.add_argument('-p', '--parts', nargs='+', type=int, choices=PARTS, default=PARTS)
+    parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS, help='repetitions per phase')
+    parser.add_argument('-s', '--scales', nargs='+', type=int, default=DEFAULT_SCALES,
+                        help='input sizes as multiples of the shipped input, 1 = shipped input')
+    parser.add_argument('-n', '--sizes', nargs='+', type=int, default=[],
+                        help='also benchmark generated inputs of these sizes (see python3 -m aoc.generators --units); '
+                             f'with at least {MIN_SIZES} sizes the growth of the solve times is fitted')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generated inputs')
+    parser.add_argument('-o', '--output', help='write JSON results to this file ("-" for stdout)')
+    parser.add_argument('--no-history', action='store_true',
+                        help='do not append the results to .aoc_cache/history.jsonl (see python3 -m aoc.history)')
+    args = parser.parse_args(argv)
+    available_days = get_days()
+    for d in args.days:
+        if d not in available_days:
+            parser.error(f'no solver for day {d}, available: {sorted(available_days)}')
+    if not args.days:
+        args.days = sorted(available_days)
+    if args.repeats < 1 or any(s < 1 for s in args.scales + args.sizes):
+        parser.error('repeats, scales and sizes must be positive')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    # drawing progress bars would be timed along with the solvers
+    progress.set_enabled(False)
+    # preprocessing is measured, not loaded from disk
+    preprocessed.set_enabled(False)
+    results = run_benchmarks(args.days, args.parts, args.scales, args.repeats, args.sizes, args.seed, log=sys.stderr)
+    report = {'meta': get_metadata(args.repeats, args.scales, args.sizes, args.seed), 'results': results,
+              'complexity': fit_results(results)}
+    if not args.no_history:
+        append_history(report)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(results))
+        if report['complexity']:
+            print()
+            print(format_fits(report['complexity']))
+        if args.output:
+            with open(args.output, mode='w') as file:
+                json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import math
+
+# growth classes from slowest to fastest growing, each as its time per unit of work for input size n
+GROWTH_CLASSES = {
+    'constant': lambda n: 1.0,
+    'linear': lambda n: n,
+    'n log n': lambda n: n * math.log(n),
+    'quadratic': lambda n: n ** 2,
+    'cubic': lambda n: n ** 3,
+    # e.g. pairs of the cells of a square grid of side n
+    'quartic': lambda n: n ** 4,
+}
+EXPONENTIAL = 'exponential'
+MIN_SIZES = 3
+# a faster growing class is only preferred if its fit is clearly better, timings are noisy
+TOLERANCE = 1.1
+
+
+def get_error(sizes, times, predict):
+    # root mean square of the log ratios, i.e. relative errors, so that the small sizes count as much
+    # as the large ones
+    ratios = []
+    for n, t in zip(sizes, times):
+        prediction = predict(n)
+        if prediction <= 0 or t <= 0:
+            return math.inf
+        ratios.append(math.log(prediction / t) ** 2)
+    return math.sqrt(sum(ratios) / len(ratios))
+
+
+def fit_line(xs, ys, weights=None):
+    # weighted least squares y = a * x + c
+    if weights is None:
+        weights = [1.0] * len(xs)
+    total = sum(weights)
+    mean_x = sum(w * x for w, x in zip(weights, xs)) / total
+    mean_y = sum(w * y for w, y in zip(weights, ys)) / total
+    variance = sum(w * (x - mean_x) ** 2 for w, x in zip(weights, xs))
+    a = sum(w * (x - mean_x) * (y - mean_y) for w, x, y in zip(weights, xs, ys)) / variance if variance else 0.0
+    return a, mean_y - a * mean_x
+
+
+def fit_work(xs, ys):
+    # y = a * x + c with a, c >= 0, the constant being the fixed overhead of a run; the squares of
+    # the relative errors are minimised, otherwise the largest size would decide alone
+    weights = [1 / y ** 2 for y in ys]
+    a, c = fit_line(xs, ys, weights)
+    if a < 0:
+        return 0.0, sum(w * y for w, y in zip(weights, ys)) / sum(weights)
+    if c < 0:
+        return sum(w * x * y for w, x, y in zip(weights, xs, ys)) / sum(w * x * x for w, x in zip(weights, xs)), 0.0
+    return a, c
+
+
+def fit_class(sizes, times, growth):
+    work = GROWTH_CLASSES[growth]
+    a, c = fit_work([work(n) for n in sizes], times)
+    return a, get_error(sizes, times, lambda n: a * work(n) + c)
+
+
+def fit_exponential(sizes, times):
+    # t = a * b ** n with b > 1, i.e. log t = log a + n log b
+    log_b, log_a = fit_line(sizes, [math.log(t) for t in times])
+    if log_b <= 0:
+        return None, math.inf
+    return math.exp(log_b), get_error(sizes, times, lambda n: math.exp(log_a + log_b * n))
+
+
+def fit_growth(sizes, times):
+    # the growth class that best explains how the times grow with the sizes
+    if len(set(sizes)) < MIN_SIZES or any(t <= 0 for t in times):
+        return None
+    fits = []
+    for growth in GROWTH_CLASSES:
+        coefficient, error = fit_class(sizes, times, growth)
+        fits.append({'growth': growth, 'coefficient': coefficient, 'error': error})
+    base, error = fit_exponential(sizes, times)
+    fits.append({'growth': EXPONENTIAL, 'coefficient': base, 'error': error})
+    best = min(fits, key=lambda f: f['error'])
+    # the slowest growing class that fits about as well as the best one
+    fit = next(f for f in fits if f['error'] <= best['error'] * TOLERANCE)
+    # k of t ~ n ** k over the measured sizes, also for growth between the classes
+    fit['exponent'] = fit_line([math.log(n) for n in sizes], [math.log(t) for t in times])[0]
+    return fit
+
+
+def fit_results(results, phase='solve'):
+    # fits the median times of the benchmark cases of generated inputs (those with a size) per day/part
+    cases = {}
+    for r in results:
+        if 'size' in r:
+            cases.setdefault((r['day'], r['part']), []).append((r['size'], r['phases'][phase]['median']))
+    fits = []
+    for (day, part), points in sorted(cases.items()):
+        points.sort()
+        fit = fit_growth([n for n, _ in points], [t for _, t in points])
+        if fit is not None:
+            fits.append(dict(fit, day=day, part=part, sizes=[n for n, _ in points]))
+    return fits
+
+
+def format_fits(fits):
+    lines = [f'{"day":>3} {"part":>4} {"growth":>12} {"error":>7} {"n^k":>6}  sizes']
+    for f in fits:
+        lines.append(f'{f["day"]:>3} {f["part"]:>4} {f["growth"]:>12} {f["error"]:>7.3f} {f["exponent"]:>6.2f}  '
+                     f'{" ".join(str(n) for n in f["sizes"])}')
+    return '\n'.join(lines)
@@ -0,0 +1,251 @@
+import os
+import sys
+import json
+import socket
+import hashlib
+import argparse
+
+from aoc.paths import get_cache_dir
+
+# the client only needs the standard library and aoc.paths, the solvers are imported by the server alone
+SOCKET_FILENAME = 'daemon.sock'
+INPUTS_DIR_NAME = 'daemon'
+PARTS = [1, 2]
+BUFFER_SIZE = 2 ** 16
+
+
+def get_socket_path():
+    return os.path.join(get_cache_dir(), SOCKET_FILENAME)
+
+
+def read_message(connection):
+    # one JSON document per connection and direction, the sender shuts down its side when done
+    chunks = []
+    while True:
+        chunk = connection.recv(BUFFER_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return json.loads(b''.join(chunks))
+
+
+def send_message(connection, message):
+    connection.sendall(json.dumps(message).encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def request(message, socket_path=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path or get_socket_path())
+        send_message(connection, message)
+        return read_message(connection)
+
+
+# server
+
+
+def write_input(text):
+    # inputs sent as bytes are solved from a file like any other input, named by their contents so
+    # that repeated queries reuse the file and its cached answers
+    data = text.encode()
+    path = os.path.join(get_cache_dir(INPUTS_DIR_NAME), f'{hashlib.sha256(data).hexdigest()}.txt')
+    if not os.path.exists(path):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, mode='wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+class Solver:
+    def __init__(self, preload_days=()):
+        from aoc.result_cache import get_package_hash
+        self.get_package_hash = get_package_hash
+        self.package_hash = get_package_hash()
+        self.import_package()
+        for day_number in preload_days:
+            self.load_day(day_number)
+
+    def import_package(self):
+        from aoc import progress
+        from aoc.registry import get_day
+        # nobody watches the daemon's stderr
+        progress.set_enabled(False)
+        self.get_day = get_day
+        # source modification times of the imported days, a changed day is imported again
+        self.module_mtimes = {}
+
+    def reload_package(self):
+        # the days build on the aoc package, after a change to it every module but this one is imported
+        # again, the days included
+        from aoc.registry import MODULE_PREFIX
+        for name in list(sys.modules):
+            if name.startswith(MODULE_PREFIX) or (name.startswith('aoc.') and name != __name__):
+                del sys.modules[name]
+        self.import_package()
+
+    def load_day(self, day_number):
+        package_hash = self.get_package_hash()
+        if package_hash != self.package_hash:
+            self.reload_package()
+            self.package_hash = package_hash
+        day = self.get_day(day_number)
+        mtime = os.path.getmtime(day.module_path)
+        if self.module_mtimes.get(day_number, mtime) != mtime:
+            sys.modules.pop(day.module_name, None)
+        day.module
+        self.module_mtimes[day_number] = mtime
+        return day
+
+    def solve(self, message):
+        day_number = message['day']
+        parts = message.get('parts') or PARTS
+        path = message.get('path')
+        if message.get('input') is not None:
+            path = write_input(message['input'])
+        # imported after loading the day, which may import the package anew
+        self.load_day(day_number)
+        from aoc.result_cache import to_json_value
+        from aoc.runner import run
+        results = []
+        # the parts of days with `solve_parts` share their preprocess, as in the runner
+        shared_answers = {}
+        for part in parts:
+            r = run(day_number, part, use_example_input=message.get('example', False),
+                    use_cache=message.get('use_cache', True), path=path, shared_answers=shared_answers)
+            results.append({'day': r.day, 'part': r.part, 'example': r.use_example_input,
+                            'solution': to_json_value(r.solution), 'duration': r.duration, 'cached': r.cached,
+                            'error': r.error})
+        return {'results': results}
+
+
+def serve(socket_path, preload_days=()):
+    import socketserver
+    import threading
+    from aoc.registry import get_days
+
+    if os.path.exists(socket_path):
+        try:
+            request({'command': 'ping'}, socket_path)
+        except OSError:
+            # left behind by a daemon that was killed
+            os.unlink(socket_path)
+        else:
+            print(f'a daemon is already listening on {socket_path}', file=sys.stderr)
+            return 1
+    solver = Solver(preload_days)
+    available_days = get_days()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            try:
+                message = read_message(self.request)
+                command = message.get('command', 'solve')
+                if command == 'ping':
+                    response = {'pid': os.getpid()}
+                elif command == 'stop':
+                    response = {'stopped': True}
+                    # shutdown waits for serve_forever, which waits for this handler
+                    threading.Thread(target=server.shutdown).start()
+                elif command == 'solve':
+                    if message.get('day') not in available_days:
+                        raise ValueError(f'no solver for day {message.get("day")}, '
+                                         f'available: {sorted(available_days)}')
+                    response = solver.solve(message)
+                else:
+                    raise ValueError(f'unknown command {command!r}')
+            except Exception as e:
+                # a bad request must not stop the daemon
+                response = {'error': f'{type(e).__name__}: {e}'}
+            send_message(self.request, response)
+
+    server = socketserver.UnixStreamServer(socket_path, Handler)
+    print(f'listening on {socket_path} (pid {os.getpid()})', file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+    return 0
+
+
+# client
+
+
+def format_result(result):
+    example = ' (example)' if result['example'] else ''
+    if result['error'] is not None:
+        return f'Day {result["day"]:02d} part {result["part"]}{example}: FAILED\n{result["error"]}'
+    cached = ' (cached)' if result['cached'] else ''
+    return f'Day {result["day"]:02d} part {result["part"]}{example}: {result["solution"]}' \
+           f'\t[{result["duration"] * 1000:.1f} ms]{cached}'
+
+
+def solve(args):
+    message = {'command': 'solve', 'day': args.day, 'parts': args.parts, 'example': args.example,
+               'use_cache': not args.no_cache}
+    if args.input == '-':
+        message['input'] = sys.stdin.read()
+    elif args.input is not None:
+        if not os.path.isfile(args.input):
+            print(f'no input file {args.input!r}', file=sys.stderr)
+            return 2
+        # the daemon may run in another directory
+        message['path'] = os.path.abspath(args.input)
+    response = request(message, args.socket)
+    if 'error' in response:
+        print(response['error'], file=sys.stderr)
+        return 1
+    for result in response['results']:
+        print(format_result(result))
+    return 0 if all(r['error'] is None for r in response['results']) else 1
+
+
+def ping(args):
+    print(f'daemon running, pid {request({"command": "ping"}, args.socket)["pid"]}')
+    return 0
+
+
+def stop(args):
+    request({'command': 'stop'}, args.socket)
+    return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc.daemon',
+                                     description='Keep the solvers imported in a daemon and query it over a Unix socket')
+    parser.add_argument('--socket', help=f'socket path (default: .aoc_cache/{SOCKET_FILENAME})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help='run the daemon in the foreground')
+    serve_parser.add_argument('days', nargs='*', type=int, help='days to import right away (default: all)')
+    solve_parser = commands.add_parser('solve', help='solve a day with the running daemon')
+    solve_parser.add_argument('day', type=int)
+    solve_parser.add_argument('input', nargs='?',
+                              help='input file, "-" to send stdin (default: the day\'s own input)')
+    solve_parser.add_argument('-p', '--parts', nargs='+', type=int, choices=PARTS, default=PARTS,
+                              help='parts to solve (default: both)')
+    solve_parser.add_argument('-e', '--example', action='store_true', help='use the example inputs')
+    solve_parser.add_argument('--no-cache', action='store_true', help='always solve, ignoring cached answers')
+    solve_parser.set_defaults(func=solve)
+    commands.add_parser('ping', help='check that the daemon is running').set_defaults(func=ping)
+    commands.add_parser('stop', help='stop the daemon').set_defaults(func=stop)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == 'serve':
+        from aoc.registry import get_days
+        return serve(args.socket or get_socket_path(), args.days or sorted(get_days()))
+    try:
+        return args.func(args)
+    except OSError as e:
+        print(f'no daemon listening on {args.socket or get_socket_path()} ({e.strerror}), '
+              f'start one with: python3 -m aoc.daemon serve', file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
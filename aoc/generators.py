@@ -0,0 +1,455 @@
+import os
+import re
+import sys
+import random
+import argparse
+
+from aoc.paths import get_cache_dir
+
+GENERATED_DIR_NAME = 'generated'
+
+# days whose input cannot be made larger by repeating its records
+# (single start/loop, unique node names or a fixed number of races)
+UNSCALABLE_DAYS = [6, 8, 10]
+
+
+def replicate_lines(lines, factor):
+    return lines * factor
+
+
+def replicate_numbered_lines(lines, factor, label):
+    # keep ids unique and increasing, e.g. 'Game 1:' ... 'Game 300:'
+    pattern = re.compile(f"^{label}\\s+[0-9]+:")
+    scaled = []
+    for k in range(factor):
+        for i, line in enumerate(lines):
+            scaled.append(pattern.sub(f'{label} {k * len(lines) + i + 1}:', line))
+    return scaled
+
+
+def replicate_seeds(lines, factor):
+    # seeds come in pairs for part 2, repeating the whole list keeps them paired
+    seeds = lines[0].split()[1:]
+    return [' '.join(['seeds:'] + seeds * factor)] + lines[1:]
+
+
+def replicate_blocks(lines, factor):
+    scaled = list(lines)
+    for _ in range(factor - 1):
+        scaled += [''] + lines
+    return scaled
+
+
+def replicate_sequence(lines, factor):
+    return [','.join([lines[0]] * factor)]
+
+
+SCALERS = {
+    1: replicate_lines,
+    2: lambda lines, factor: replicate_numbered_lines(lines, factor, 'Game'),
+    3: replicate_lines,
+    4: lambda lines, factor: replicate_numbered_lines(lines, factor, 'Card'),
+    5: replicate_seeds,
+    7: replicate_lines,
+    9: replicate_lines,
+    11: replicate_lines,
+    12: replicate_lines,
+    13: replicate_blocks,
+    14: replicate_lines,
+    15: replicate_sequence,
+}
+
+
+def can_scale(day_number):
+    return day_number in SCALERS
+
+
+def scale_input(day_number, lines, factor):
+    if not can_scale(day_number):
+        raise KeyError(f'no input scaler for day {day_number}')
+    return SCALERS[day_number](lines, factor)
+
+
+def write_scaled_input(day, factor):
+    # scaled inputs are written to disk so that they are read exactly like the shipped ones
+    lines = scale_input(day.number, day.read_input(1), factor)
+    path = os.path.join(get_cache_dir(GENERATED_DIR_NAME), f'input{day.name}_x{factor}.txt')
+    with open(path, mode='w') as file:
+        file.write('\n'.join(lines) + '\n')
+    return path
+
+
+# Synthetic inputs: every generator takes a size and a seeded `random.Random` and returns the lines
+# of a valid puzzle input. What the size counts depends on the day (see GENERATOR_SIZE_UNITS).
+
+SPELLED_DIGITS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+ENGINE_SYMBOLS = '*#+$/@=%&-'
+CARDS = 'AKQJT98765432'
+NODE_CHARS = 'BCDEFGHIJKLMNOPQRSTUVWXY0123456789'
+PIPES = '|-LJ7F.'
+# lattice directions (dy, dx) of both pipe ends -> pipe symbol
+PIPE_SYMBOLS = {
+    frozenset([(-1, 0), (1, 0)]): '|',
+    frozenset([(0, -1), (0, 1)]): '-',
+    frozenset([(-1, 0), (0, 1)]): 'L',
+    frozenset([(-1, 0), (0, -1)]): 'J',
+    frozenset([(1, 0), (0, -1)]): '7',
+    frozenset([(1, 0), (0, 1)]): 'F',
+}
+
+
+def generate_day01(size, rng, max_line_length=60):
+    lines = []
+    for _ in range(size):
+        parts = [str(rng.randint(1, 9))]
+        while sum(map(len, parts)) < rng.randint(4, max_line_length):
+            choice = rng.random()
+            if choice < 0.15:
+                parts.append(str(rng.randint(1, 9)))
+            elif choice < 0.35:
+                parts.append(rng.choice(SPELLED_DIGITS))
+            else:
+                parts.append(rng.choice(LOWERCASE))
+        rng.shuffle(parts)
+        lines.append(''.join(parts))
+    return lines
+
+
+def generate_day02(size, rng, max_rounds=6):
+    lines = []
+    for game_id in range(1, size + 1):
+        rounds = []
+        for _ in range(rng.randint(1, max_rounds)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            rounds.append(', '.join(f'{rng.randint(1, 20)} {color}' for color in colors))
+        lines.append(f'Game {game_id}: ' + '; '.join(rounds))
+    return lines
+
+
+def generate_day03(size, rng):
+    # size x size engine schematic
+    lines = []
+    for _ in range(size):
+        row = []
+        while len(row) < size:
+            choice = rng.random()
+            number_length = rng.randint(1, 3)
+            if choice < 0.12 and len(row) + number_length < size and (not row or not row[-1].isdigit()):
+                row += list(str(rng.randint(10 ** (number_length - 1), 10 ** number_length - 1)))
+            elif choice < 0.17:
+                row.append(rng.choice(ENGINE_SYMBOLS))
+            else:
+                row.append('.')
+        lines.append(''.join(row[:size]))
+    return lines
+
+
+def generate_day04(size, rng, num_winning=10, num_candidates=25, max_number=99):
+    lines = []
+    id_width = len(str(size))
+    for i in range(size):
+        numbers = rng.sample(range(1, max_number + 1), num_winning + num_candidates)
+        winning = numbers[:num_winning]
+        # cards never win copies of cards past the end of the table
+        num_matches = min(rng.randint(0, num_winning), size - 1 - i)
+        candidates = winning[:num_matches] + numbers[num_winning:num_winning + num_candidates - num_matches]
+        rng.shuffle(candidates)
+        lines.append(f'Card {i + 1:>{id_width}}: ' + ' '.join(f'{n:>2}' for n in winning) + ' | ' +
+                     ' '.join(f'{n:>2}' for n in candidates))
+    return lines
+
+
+def generate_day05(size, rng, num_mappings=7, max_value=2 ** 32):
+    # `size` seed ranges and `size` ranges per mapping; ranges of one mapping never overlap
+    seeds = []
+    for _ in range(size):
+        start = rng.randrange(max_value // 2)
+        seeds += [start, rng.randint(1, max_value // (4 * size))]
+    lines = ['seeds: ' + ' '.join(map(str, seeds))]
+    names = ['seed', 'soil', 'fertilizer', 'water', 'light', 'temperature', 'humidity', 'location']
+    for m in range(num_mappings):
+        lines += ['', f'{names[m]}-to-{names[m + 1]} map:']
+        bounds = sorted(rng.sample(range(max_value), 2 * size))
+        for k in range(size):
+            src, end = bounds[2 * k], bounds[2 * k + 1]
+            length = end - src
+            dest = rng.randrange(max_value - length)
+            lines.append(f'{dest} {src} {length}')
+    return lines
+
+
+def generate_day06(size, rng):
+    times = [rng.randint(7, 100) for _ in range(size)]
+    distances = []
+    for t in times:
+        best = (t // 2) * (t - t // 2)
+        # records never have more digits than the race time, so the kerned race of part 2 can be won too
+        distances.append(rng.randint(0, min(best - 1, 10 ** len(str(t)) - 1)))
+    width = max(len(str(x)) for x in times + distances) + 2
+    return ['Time:    ' + ''.join(f'{t:>{width}}' for t in times),
+            'Distance:' + ''.join(f'{d:>{width}}' for d in distances)]
+
+
+def generate_day07(size, rng):
+    return [''.join(rng.choice(CARDS) for _ in range(5)) + f' {rng.randint(1, 1000)}' for _ in range(size)]
+
+
+def generate_day08(size, rng, num_ghosts=6):
+    # `size` is roughly the number of nodes. Every ghost walks a chain of layers from its start (..A) to its
+    # destination (..Z) and from there back to the first layer, so each walk is a cycle of the chain's length
+    # whatever the directions are; most layers have two nodes so that left and right lead different ways.
+    names = set()
+
+    def new_name(last_char=None):
+        while True:
+            name = ''.join(rng.choice(NODE_CHARS) for _ in range(2)) + (last_char or rng.choice(NODE_CHARS))
+            if name not in names:
+                names.add(name)
+                return name
+
+    num_ghosts = max(1, min(num_ghosts, size // 8))
+    chain_length = max(2, size // (2 * num_ghosts))
+    nodes = {}
+    for ghost in range(num_ghosts):
+        length = rng.randint(max(2, chain_length // 2), chain_length)
+        start = 'AAA' if ghost == 0 else new_name('A')
+        end = 'ZZZ' if ghost == 0 else new_name('Z')
+        names.update([start, end])
+        layers = [[new_name(), new_name()] for _ in range(length - 1)]
+        # part 1 walks until exactly ZZZ, so the destination layer has no twin
+        layers.append([end])
+        nodes[start] = (layers[0][0], layers[0][-1])
+        for k, layer in enumerate(layers):
+            next_layer = layers[(k + 1) % len(layers)]
+            for name in layer:
+                nodes[name] = (next_layer[0], next_layer[-1]) if rng.random() < 0.5 else (next_layer[-1], next_layer[0])
+    directions = ''.join(rng.choice('LR') for _ in range(max(2, size // 20)))
+    items = list(nodes.items())
+    rng.shuffle(items)
+    return [directions, ''] + [f'{name} = ({left}, {right})' for name, (left, right) in items]
+
+
+def generate_day09(size, rng, length=21, max_degree=6):
+    # polynomial sequences, so the differences reach zero before running out of values
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(0, min(max_degree, length - 2)) + 1)]
+        values = [sum(c * x ** k for k, c in enumerate(coefficients)) for x in range(length)]
+        lines.append(' '.join(map(str, values)))
+    return lines
+
+
+def generate_day10(size, rng):
+    # size x size tiles. The loop runs along the outline of a random column-convex polyomino whose
+    # neighbouring columns share at least one square, which keeps the outline a simple closed path.
+    size = max(size, 5)
+    squares = size - 3  # squares between the tile centres, keeping a margin of one tile
+    intervals = []
+    top, bottom = 0, squares
+    for _ in range(squares):
+        new_top = rng.randint(max(0, top - 2), min(bottom - 1, top + 2))
+        new_bottom = rng.randint(max(new_top + 1, top + 1), min(squares, bottom + 2))
+        top, bottom = new_top, max(new_bottom, new_top + 1)
+        intervals.append((top, bottom))
+
+    def is_inside(r, c):
+        return 0 <= c < len(intervals) and intervals[c][0] <= r < intervals[c][1]
+
+    # a tile is on the loop if the squares around it are neither all inside nor all outside
+    ends = {}
+    for y in range(squares + 1):
+        for x in range(squares + 1):
+            around = {(dy, dx): is_inside(y + dy, x + dx) for dy in (-1, 0) for dx in (-1, 0)}
+            directions = []
+            if around[(-1, -1)] != around[(-1, 0)]:
+                directions.append((-1, 0))
+            if around[(0, -1)] != around[(0, 0)]:
+                directions.append((1, 0))
+            if around[(-1, -1)] != around[(0, -1)]:
+                directions.append((0, -1))
+            if around[(-1, 0)] != around[(0, 0)]:
+                directions.append((0, 1))
+            if directions:
+                ends[(y + 1, x + 1)] = frozenset(directions)
+    grid = [[rng.choice(PIPES) for _ in range(size)] for _ in range(size)]
+    for (y, x), directions in ends.items():
+        grid[y][x] = PIPE_SYMBOLS[directions]
+    start_y, start_x = rng.choice(sorted(ends))
+    grid[start_y][start_x] = 'S'
+    # no other pipe may connect to the start (loop tiles next to it only do so along the loop)
+    for dy, dx in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        if (start_y + dy, start_x + dx) not in ends:
+            grid[start_y + dy][start_x + dx] = '.'
+    return [''.join(row) for row in grid]
+
+
+def generate_day11(size, rng, density=0.02):
+    lines = [''.join('#' if rng.random() < density else '.' for _ in range(size)) for _ in range(size)]
+    if '#' not in ''.join(lines):
+        lines[0] = '#' + lines[0][1:]
+    return lines
+
+
+def generate_day12(size, rng, min_length=5, max_length=20, unknown_rate=0.45):
+    lines = []
+    while len(lines) < size:
+        row = ''.join(rng.choice('#.') for _ in range(rng.randint(min_length, max_length)))
+        counts = [len(group) for group in re.findall('#+', row)]
+        if not counts:
+            continue
+        row = ''.join('?' if rng.random() < unknown_rate else c for c in row)
+        lines.append(row + ' ' + ','.join(map(str, counts)))
+    return lines
+
+
+def get_reflections(rows, max_differences):
+    # all lines between rows (1-based offsets) where the mirrored rows differ in exactly `max_differences` spots
+    reflections = []
+    for offset in range(1, len(rows)):
+        differences = 0
+        for k in range(min(offset, len(rows) - offset)):
+            differences += sum(a != b for a, b in zip(rows[offset - 1 - k], rows[offset + k]))
+        if differences == max_differences:
+            reflections.append(offset)
+    return reflections
+
+
+def get_all_reflections(rows, max_differences):
+    columns = [''.join(column) for column in zip(*rows)]
+    return get_reflections(rows, max_differences) + [-r for r in get_reflections(columns, max_differences)]
+
+
+def generate_day13_pattern(rng):
+    # one perfect reflection near one edge and one reflection with a single smudge near the other
+    while True:
+        height = rng.randint(7, 17)
+        width = rng.randint(5, 17)
+        rows = [''.join(rng.choice('#.') for _ in range(width)) for _ in range(height)]
+        perfect = rng.randint(1, height // 2 - 1)
+        smudged = rng.randint((height + 2 * perfect + 1) // 2, height - 1)
+        for k in range(perfect):
+            rows[perfect + k] = rows[perfect - 1 - k]
+        for k in range(height - smudged):
+            rows[smudged - 1 - k] = rows[smudged + k]
+        y = rng.randint(smudged, height - 1)
+        x = rng.randrange(width)
+        rows[y] = rows[y][:x] + ('.' if rows[y][x] == '#' else '#') + rows[y][x + 1:]
+        if rng.random() < 0.5:
+            rows = [''.join(column) for column in zip(*rows)]
+        # random rows can reflect by accident, only keep patterns with exactly one line of each kind
+        if len(get_all_reflections(rows, 0)) == 1 and len(get_all_reflections(rows, 1)) == 1:
+            return rows
+
+
+def generate_day13(size, rng):
+    lines = []
+    for p in range(size):
+        if p > 0:
+            lines.append('')
+        lines += generate_day13_pattern(rng)
+    return lines
+
+
+def generate_day14(size, rng, round_rate=0.15, cube_rate=0.15):
+    lines = []
+    for _ in range(size):
+        row = []
+        for _ in range(size):
+            choice = rng.random()
+            row.append('O' if choice < round_rate else '#' if choice < round_rate + cube_rate else '.')
+        lines.append(''.join(row))
+    return lines
+
+
+def generate_day15(size, rng):
+    labels = set()
+    while len(labels) < max(1, size // 4):
+        labels.add(''.join(rng.choice(LOWERCASE) for _ in range(rng.randint(2, 6))))
+    labels = sorted(labels)
+    steps = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        steps.append(f'{label}-' if rng.random() < 0.3 else f'{label}={rng.randint(1, 9)}')
+    return [','.join(steps)]
+
+
+GENERATORS = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    9: generate_day09,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+    14: generate_day14,
+    15: generate_day15,
+}
+GENERATOR_SIZE_UNITS = {
+    1: 'lines',
+    2: 'games',
+    3: 'grid side',
+    4: 'cards',
+    5: 'seed ranges and ranges per map',
+    6: 'races',
+    7: 'hands',
+    8: 'nodes (about)',
+    9: 'histories',
+    10: 'grid side',
+    11: 'grid side',
+    12: 'rows',
+    13: 'patterns',
+    14: 'grid side',
+    15: 'steps',
+}
+
+
+def generate_input(day_number, size, seed=0):
+    if day_number not in GENERATORS:
+        raise KeyError(f'no input generator for day {day_number}')
+    return GENERATORS[day_number](size, random.Random(f'{day_number}:{size}:{seed}'))
+
+
+def write_generated_input(day, size, seed=0):
+    path = os.path.join(get_cache_dir(GENERATED_DIR_NAME), f'input{day.name}_n{size}_s{seed}.txt')
+    lines = generate_input(day.number, size, seed)
+    with open(path, mode='w') as file:
+        file.write('\n'.join(lines) + '\n')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='aoc.generators', description='Generate a synthetic puzzle input')
+    # both only optional for --units
+    parser.add_argument('day', type=int, nargs='?', choices=sorted(GENERATORS))
+    parser.add_argument('size', type=int, nargs='?', help='input size, see --units')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='write to this file instead of stdout')
+    parser.add_argument('--units', action='store_true', help='print what the size counts for each day and exit')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.units:
+        for day_number, unit in GENERATOR_SIZE_UNITS.items():
+            print(f'{day_number:>2}: {unit}')
+        return 0
+    missing = [name for name in ('day', 'size') if getattr(args, name) is None]
+    if missing:
+        parser.error(f'the following arguments are required: {", ".join(missing)}')
+    if args.size < 1:
+        parser.error('size must be positive')
+    text = '\n'.join(generate_input(args.day, args.size, args.seed)) + '\n'
+    if args.output:
+        with open(args.output, mode='w') as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import numpy as np
+
+from aoc.inputs import map_file
+
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+# offsets (dy, dx) of the 4 and 8 cells around a cell
+ORTHOGONAL_OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+ALL_OFFSETS = [(dy, dx) for dy in range(-1, 2) for dx in range(-1, 2) if (dy, dx) != (0, 0)]
+
+
+# grids are 2-D uint8 arrays of the input's bytes, indexed [y, x]; the ones returned here are
+# read-only, solvers that modify their grid work on a copy
+
+
+def load_grid(path):
+    # nothing is read or copied until cells are accessed
+    return from_buffer(map_file(path))
+
+
+def from_buffer(buffer):
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    # trailing line breaks and blank lines are not part of the grid
+    end = len(data)
+    while end > 0 and data[end - 1] in (NEWLINE, CARRIAGE_RETURN):
+        end -= 1
+    if end == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    line_end = buffer.find(b'\n', 0, end)
+    if line_end == -1:
+        line_end = end
+    # each line is followed by its line break, which the strides skip
+    stride = line_end + 1
+    width = line_end - 1 if line_end > 0 and data[line_end - 1] == CARRIAGE_RETURN else line_end
+    height = (end + stride - 1) // stride
+    if end - (height - 1) * stride != width or np.any(data[line_end:end:stride] != NEWLINE):
+        raise ValueError('grid lines differ in length')
+    return np.lib.stride_tricks.as_strided(data, shape=(height, width), strides=(stride, 1), writeable=False)
+
+
+def from_lines(lines):
+    # for grids that are only part of an input, e.g. the blocks of a BLOCKS input
+    lines = list(lines)
+    if len(lines) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError('grid lines differ in length')
+    return np.frombuffer(''.join(lines).encode(), dtype=np.uint8).reshape(len(lines), width)
+
+
+def to_lines(grid):
+    return [row.tobytes().decode() for row in grid]
+
+
+def mask(grid, chars):
+    # boolean array, True where the cell is any of `chars`
+    codes = list(chars.encode())
+    if len(codes) == 1:
+        return grid == codes[0]
+    return np.isin(grid, codes)
+
+
+def find(grid, char):
+    # (y, x) positions of every `char`, in row-major order
+    return np.argwhere(grid == ord(char))
+
+
+def neighbours(array, dy, dx, fill=0):
+    # the value of every cell's neighbour at offset (dy, dx), `fill` where it lies outside the array
+    height, width = array.shape
+    shifted = np.full_like(array, fill)
+    target_y = slice(max(0, -dy), min(height, height - dy))
+    target_x = slice(max(0, -dx), min(width, width - dx))
+    source_y = slice(max(0, dy), min(height, height + dy))
+    source_x = slice(max(0, dx), min(width, width + dx))
+    shifted[target_y, target_x] = array[source_y, source_x]
+    return shifted
+
+
+def dilate(cells, offsets=ALL_OFFSETS):
+    # a boolean mask grown by one cell in the direction of each offset
+    grown = cells.copy()
+    for dy, dx in offsets:
+        grown |= neighbours(cells, dy, dx, fill=False)
+    return grown
+
+
+def transpose(grid):
+    # columns as rows, a view without copying
+    return grid.T
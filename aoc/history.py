@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from aoc.paths import CACHE_DIR, ROOT_DIR, get_cache_dir
+
+HISTORY_FILENAME = 'history.jsonl'
+# a day/part regresses if it got slower or used more memory than the baseline by more than this
+DEFAULT_TIME_THRESHOLD = 10.0
+DEFAULT_MEMORY_THRESHOLD = 10.0
+# sub-millisecond medians jitter by more than any sensible threshold, smaller differences are ignored
+MIN_TIME_DIFFERENCE = 0.001
+MIN_MEMORY_DIFFERENCE = 64 * 2 ** 10
+COMPARED_PHASE = 'solve'
+
+
+def get_history_path():
+    return os.path.join(CACHE_DIR, HISTORY_FILENAME)
+
+
+def get_git_revision():
+    # (commit, dirty), with uncommitted changes to tracked files the numbers do not belong to the commit alone
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, status.strip() != ''
+
+
+def append_history(report):
+    commit, dirty = get_git_revision()
+    entry = dict(report, commit=commit, dirty=dirty)
+    get_cache_dir()
+    # one JSON document per line, appending never rewrites earlier entries
+    with open(get_history_path(), mode='a') as file:
+        file.write(json.dumps(entry) + '\n')
+    return entry
+
+
+def load_history():
+    entries = []
+    try:
+        with open(get_history_path(), mode='r') as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # e.g. a line cut short by an interrupted run
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def find_entry(history, revision=None, exclude_commit=None):
+    # index of the latest entry whose commit starts with `revision` (any entry if None),
+    # skipping those of `exclude_commit`
+    for i in reversed(range(len(history))):
+        commit = history[i].get('commit') or ''
+        if exclude_commit is not None and commit == exclude_commit:
+            continue
+        if revision is None or commit.startswith(revision):
+            return i
+    return None
+
+
+def get_case_key(case):
+    # generated inputs of the same size but another seed are different inputs, not the same one run again
+    return case['day'], case['part'], case['label'], case.get('seed')
+
+
+def get_change(baseline_value, current_value):
+    if not baseline_value:
+        return None
+    return (current_value - baseline_value) / baseline_value * 100
+
+
+def compare(baseline, current, time_threshold=DEFAULT_TIME_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    baseline_cases = {get_case_key(c): c for c in baseline['results']}
+    rows = []
+    for case in current['results']:
+        key = get_case_key(case)
+        if key not in baseline_cases:
+            continue
+        base = baseline_cases[key]
+        base_time = base['phases'][COMPARED_PHASE]['median']
+        time = case['phases'][COMPARED_PHASE]['median']
+        time_change = get_change(base_time, time)
+        memory_change = get_change(base['peak_memory'], case['peak_memory'])
+        slower = time_change is not None and time_change > time_threshold and \
+            time - base_time > MIN_TIME_DIFFERENCE
+        larger = memory_change is not None and memory_change > memory_threshold and \
+            case['peak_memory'] - base['peak_memory'] > MIN_MEMORY_DIFFERENCE
+        rows.append({'day': key[0], 'part': key[1], 'label': key[2],
+                     'baseline_time': base_time, 'time': time, 'time_change': time_change,
+                     'baseline_memory': base['peak_memory'], 'memory': case['peak_memory'],
+                     'memory_change': memory_change, 'regressed': slower or larger})
+    return rows
+
+
+def compare_growth(baseline, current):
+    # day/parts whose fitted growth class (see aoc.complexity) differs from the baseline's
+    baseline_fits = {(f['day'], f['part']): f for f in baseline.get('complexity', [])}
+    rows = []
+    for fit in current.get('complexity', []):
+        base = baseline_fits.get((fit['day'], fit['part']))
+        if base is not None:
+            rows.append({'day': fit['day'], 'part': fit['part'], 'baseline_growth': base['growth'],
+                         'growth': fit['growth'], 'changed': base['growth'] != fit['growth']})
+    return rows
+
+
+def format_growth_comparison(rows):
+    lines = [f'{"day":>3} {"part":>4} {"base growth":>12} {"growth":>12}']
+    for r in rows:
+        flag = '  CHANGED' if r['changed'] else ''
+        lines.append(f'{r["day"]:>3} {r["part"]:>4} {r["baseline_growth"]:>12} {r["growth"]:>12}{flag}')
+    changed = sum(r['changed'] for r in rows)
+    lines.append(f'{len(rows)} compared, {changed} changed growth class')
+    return '\n'.join(lines)
+
+
+def format_change(change):
+    return f'{"-":>8}' if change is None else f'{change:>+7.1f}%'
+
+
+def format_comparison(rows):
+    header = f'{"day":>3} {"part":>4} {"input":>6} {"base ms":>10} {"ms":>10} {"change":>8} ' \
+             f'{"base MiB":>9} {"MiB":>9} {"change":>8}'
+    lines = [header]
+    for r in rows:
+        flag = '  REGRESSED' if r['regressed'] else ''
+        lines.append(f'{r["day"]:>3} {r["part"]:>4} {r["label"]:>6} {r["baseline_time"] * 1000:>10.2f} '
+                     f'{r["time"] * 1000:>10.2f} {format_change(r["time_change"])} '
+                     f'{r["baseline_memory"] / 2 ** 20:>9.2f} {r["memory"] / 2 ** 20:>9.2f} '
+                     f'{format_change(r["memory_change"])}{flag}')
+    regressed = sum(r['regressed'] for r in rows)
+    lines.append(f'{len(rows)} compared, {regressed} regressed')
+    return '\n'.join(lines)
+
+
+def describe(entry):
+    commit = (entry.get('commit') or 'unknown')[:12]
+    dirty = '+dirty' if entry.get('dirty') else ''
+    return f'{commit}{dirty} {entry["meta"]["timestamp"]}'
+
+
+def list_entries(args):
+    for entry in load_history():
+        days = sorted({c['day'] for c in entry['results']})
+        print(f'{describe(entry)} days {days} repeats {entry["meta"]["repeats"]}')
+    return 0
+
+
+def compare_entries(args):
+    history = load_history()
+    current_index = find_entry(history, args.current)
+    if current_index is None:
+        print(f'no benchmark recorded for {args.current or "any commit"}', file=sys.stderr)
+        return 2
+    current = history[current_index]
+    # the baseline is an earlier run, by default the latest one of another commit
+    exclude_commit = current.get('commit') if args.baseline is None else None
+    baseline_index = find_entry(history[:current_index], args.baseline, exclude_commit)
+    if baseline_index is None:
+        print(f'no earlier run recorded for {args.baseline or "another commit"}', file=sys.stderr)
+        return 2
+    baseline = history[baseline_index]
+    rows = compare(baseline, current, args.threshold, args.memory_threshold)
+    print(f'baseline {describe(baseline)}\ncurrent  {describe(current)}')
+    print(format_comparison(rows))
+    growth_rows = compare_growth(baseline, current)
+    if growth_rows:
+        print(format_growth_comparison(growth_rows))
+    return 1 if any(r['regressed'] for r in rows) or any(r['changed'] for r in growth_rows) else 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc.history', description='Benchmark history recorded by aoc.bench')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list the recorded benchmark runs').set_defaults(func=list_entries)
+    compare_parser = commands.add_parser('compare', help='compare a run against a baseline, exit 1 on regressions '
+                                                         'or a changed growth class')
+    compare_parser.add_argument('baseline', nargs='?',
+                                help='commit (prefix) of the baseline (default: latest run of another commit)')
+    compare_parser.add_argument('current', nargs='?', help='commit (prefix) to check (default: latest run)')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                                help='allowed increase of the median solve time in percent')
+    compare_parser.add_argument('-m', '--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                                help='allowed increase of the peak memory in percent')
+    compare_parser.set_defaults(func=compare_entries)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
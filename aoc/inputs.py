@@ -0,0 +1,113 @@
+import os
+import mmap
+
+EXAMPLE_FILENAME = "example_input.txt"
+EXAMPLE_FILENAME_PART2 = "example_input2.txt"
+
+# how a day wants its input handed to `solve`, declared in the day module as `INPUT_MODE`
+LINES = 'lines'  # list of lines, for days that need random access
+STREAM = 'stream'  # generator of lines, read while solving
+BLOCKS = 'blocks'  # generator of blank-line separated blocks, each a list of lines
+GRID = 'grid'  # read-only 2-D uint8 array of the characters, memory-mapped (see aoc.grid)
+BYTES = 'bytes'  # read-only buffer of the whole file, memory-mapped, for days that scan it vectorised
+INPUT_MODES = [LINES, STREAM, BLOCKS, GRID, BYTES]
+# `INPUT_MODE` may also map each part to its mode, e.g. {1: BYTES, 2: STREAM}
+# bytes of a buffer handed out per chunk by iter_line_chunks; small enough for the temporary arrays of
+# a vectorised pass over a chunk to stay in cache, and bounding their memory for inputs of any size
+LINE_CHUNK_SIZE = 2 ** 20
+
+
+def get_input_filename(day_number, part, use_example_input=False):
+    if use_example_input:
+        return EXAMPLE_FILENAME if part == 1 else EXAMPLE_FILENAME_PART2
+    return f'input{day_number:02d}.txt'
+
+
+def get_input_path(directory, day_number, part, use_example_input=False):
+    return os.path.join(directory, get_input_filename(day_number, part, use_example_input))
+
+
+# no module state is touched, so any input may be read any number of times per process
+def read_lines(path):
+    with open(path, mode='r') as file:
+        lines = file.read().splitlines()
+    return lines
+
+
+def iter_lines(path):
+    # only the current line is held in memory, the file is closed once the generator is exhausted
+    with open(path, mode='r') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+def iter_blocks(path):
+    block = []
+    for line in iter_lines(path):
+        if line == "":
+            # empty line, current block done (repeated empty lines do not yield empty blocks)
+            if block:
+                yield block
+            block = []
+            continue
+        block.append(line)
+    if block:
+        yield block
+
+
+def map_file(path):
+    # the file is memory-mapped, nothing is read or copied until the buffer is accessed
+    with open(path, mode='rb') as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return b''
+
+
+def iter_line_chunks(buffer, size=LINE_CHUNK_SIZE):
+    # consecutive views of about `size` bytes of the buffer, each extended to the end of its last line,
+    # so that every line is in exactly one chunk; nothing is copied
+    view = memoryview(buffer)
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b'\n', min(start + size, len(buffer)) - 1)
+        end = len(buffer) if end == -1 else end + 1
+        yield view[start:end]
+        start = end
+
+
+# the loaded input remembers the file it came from, so preprocessed forms of it can be cached
+class InputLines(list):
+    def __init__(self, lines, path):
+        super().__init__(lines)
+        self.path = path
+
+
+class InputStream:
+    def __init__(self, iterator, path):
+        self.iterator = iterator
+        self.path = path
+
+    def __iter__(self):
+        # hand out the generator itself, wrapping every item would slow down reading
+        return self.iterator
+
+    def __next__(self):
+        return next(self.iterator)
+
+
+def load_input(path, mode=LINES):
+    if mode == LINES:
+        return InputLines(read_lines(path), path)
+    if mode == STREAM:
+        return InputStream(iter_lines(path), path)
+    if mode == BLOCKS:
+        return InputStream(iter_blocks(path), path)
+    if mode == GRID:
+        # numpy is only imported by the days that use grids
+        from aoc.grid import load_grid
+        return load_grid(path)
+    if mode == BYTES:
+        return map_file(path)
+    raise KeyError(f'unknown input mode {mode!r}, expected one of {INPUT_MODES}')
@@ -0,0 +1,115 @@
+import re
+from itertools import islice
+
+# numpy is imported by the parsers when they are first used, importing a day that only parses a few
+# numbers with them must not pay for it (see aoc.startup)
+ZERO = ord('0')
+NINE = ord('9')
+MINUS = ord('-')
+NEWLINE = ord('\n')
+# numbers of up to 18 digits always fit in int64, longer ones are parsed as Python ints
+MAX_INT64_DIGITS = 18
+# lines parsed per vectorised pass by the line parsers, only one chunk of a stream is held as text
+CHUNK_LINES = 2 ** 12
+# chunks of fewer bytes are parsed with INT_PATTERN, numpy only pays off (and is only imported) for
+# larger ones
+MIN_VECTORISED_BYTES = 2 ** 16
+# the same numbers as found by find_ints
+INT_PATTERN = re.compile('-?[0-9]+')
+
+
+# every run of digits in a text is a number, a '-' right before it makes it negative; anything else
+# separates the numbers, e.g. 'Card 3: 41 48 | 83 -6' holds 3, 41, 48, 83 and -6
+
+
+def find_ints(data):
+    # the numbers of a uint8 array of text, with the positions where their digits start and end: the
+    # values are int64, or Python ints in an object array if any number is too long for int64
+    import numpy as np
+
+    is_digit = (data >= ZERO) & (data <= NINE)
+    # a number starts where a digit follows a non-digit and ends before the next non-digit
+    edges = np.flatnonzero(np.diff(is_digit, prepend=False, append=False))
+    starts = edges[::2]
+    ends = edges[1::2]
+    lengths = ends - starts
+    if len(starts) == 0:
+        values = np.zeros(0, dtype=np.int64)
+    elif lengths.max() > MAX_INT64_DIGITS:
+        text = data.tobytes()
+        values = np.array([int(text[start:end]) for start, end in zip(starts, ends)], dtype=object)
+    else:
+        # each digit times the power of ten of its place, summed per number
+        digit_positions = np.flatnonzero(is_digit)
+        places = np.repeat(ends - 1, lengths) - digit_positions
+        powers_of_ten = 10 ** np.arange(MAX_INT64_DIGITS, dtype=np.int64)
+        digits = (data[digit_positions] - ZERO).astype(np.int64) * powers_of_ten[places]
+        values = np.add.reduceat(digits, np.cumsum(lengths) - lengths)
+    negative = np.zeros(len(starts), dtype=bool)
+    negative[starts > 0] = data[starts[starts > 0] - 1] == MINUS
+    values[negative] = -values[negative]
+    return values, starts, ends
+
+
+def parse_ints(text):
+    # all numbers of a str or bytes in one vectorised pass, as a flat array and the offsets of its
+    # lines: the numbers of line i are values[offsets[i]:offsets[i + 1]]
+    if isinstance(text, str):
+        text = text.encode()
+    import numpy as np
+
+    data = np.frombuffer(text, dtype=np.uint8)
+    values, starts, _ = find_ints(data)
+    line_ends = np.flatnonzero(data == NEWLINE)
+    # a last line without a line break still counts
+    num_lines = len(line_ends) + (len(data) > 0 and data[-1] != NEWLINE)
+    lines = np.searchsorted(line_ends, starts)
+    offsets = np.searchsorted(lines, np.arange(num_lines + 1))
+    return values, offsets
+
+
+def parse_int_table(text):
+    # the numbers as a 2-D array with one row per line, for texts whose lines all hold as many numbers
+    import numpy as np
+
+    values, offsets = parse_ints(text)
+    counts = np.diff(offsets)
+    if len(counts) == 0:
+        return values.reshape(0, 0)
+    if np.any(counts != counts[0]):
+        raise ValueError('lines hold different numbers of integers')
+    return values.reshape(len(counts), counts[0])
+
+
+def to_rows(values, offsets):
+    # the numbers of every line as a list of Python ints
+    values = values.tolist()
+    return [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def iter_line_chunks(lines, chunk_lines=CHUNK_LINES):
+    # the lines as texts of `chunk_lines` lines each, every line ended by a line break
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            return
+        yield '\n'.join(chunk) + '\n', len(chunk)
+
+
+def iter_int_chunks(lines, chunk_lines=CHUNK_LINES):
+    # parse_ints of the lines, one (values, offsets) pair per chunk of `chunk_lines` lines
+    for text, _ in iter_line_chunks(lines, chunk_lines):
+        yield parse_ints(text)
+
+
+def parse_int_lines(lines, chunk_lines=CHUNK_LINES):
+    # the numbers of every line as a list of Python ints, read a chunk at a time so that streams stay
+    # streamed; small chunks, e.g. all of a short input, are parsed without numpy
+    rows = []
+    for text, num_lines in iter_line_chunks(lines, chunk_lines):
+        if len(text) < MIN_VECTORISED_BYTES:
+            rows += [[int(x) for x in INT_PATTERN.findall(line)] for line in text.split('\n', num_lines - 1)]
+        else:
+            rows += to_rows(*parse_ints(text))
+    return rows
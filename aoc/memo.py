@@ -0,0 +1,117 @@
+import gc
+import sys
+import types
+import functools
+
+# memoisation layers of the day solvers by name, reported by the runner's --cache-stats
+_caches = {}
+# objects that are shared with the rest of the program rather than held by a cache
+NOT_HELD_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+
+
+def get_footprint(*objects):
+    # bytes of the objects and everything they reference, counting objects referenced twice once
+    seen = set()
+    stack = list(objects)
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, NOT_HELD_TYPES):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return total
+
+
+class LruCacheStats:
+    # functools.lru_cache keeps its own hit and miss counts, which cost nothing to collect
+    def __init__(self, name, cached_func):
+        self.name = name
+        self.cached_func = cached_func
+        self.reset()
+
+    def reset(self):
+        # counts are reported from here on, entries of earlier runs stay cached
+        self.base = self.cached_func.cache_info()
+
+    def get_stats(self):
+        info = self.cached_func.cache_info()
+        hits = info.hits - self.base.hits
+        misses = info.misses - self.base.misses
+        if info.misses < self.base.misses:
+            # cleared since, e.g. by Day.reset_caches
+            hits, misses = info.hits, info.misses
+            size_before = 0
+        else:
+            size_before = self.base.currsize
+        # every miss adds an entry, so any entry that is not there anymore was evicted
+        evictions = misses - (info.currsize - size_before)
+        return {'name': self.name, 'hits': hits, 'misses': misses, 'evictions': evictions,
+                'size': info.currsize, 'maxsize': info.maxsize, 'footprint': self.get_footprint()}
+
+    def get_footprint(self):
+        # the cache is only reachable through the references the garbage collector sees: its dict of
+        # links and, next to it, the keys and results the links hold
+        held = [r for r in gc.get_referents(self.cached_func) if r is not self.cached_func.__dict__]
+        links = [link for r in held if isinstance(r, dict) for link in r.values()]
+        return get_footprint(*held, *links)
+
+
+def memoize(maxsize=128):
+    # functools.lru_cache, with its statistics reported by the runner
+    def decorator(func):
+        cached_func = functools.lru_cache(maxsize=maxsize)(func)
+        name = f'{func.__module__}.{func.__qualname__}'
+        _caches[name] = LruCacheStats(name, cached_func)
+        return cached_func
+    return decorator
+
+
+class TrackedDict(dict):
+    # a dict used as a cache, membership tests count as hits or misses; entries are never evicted
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        # the latest cache of a name is the one reported, until the next reset
+        _caches[name] = self
+
+    def __contains__(self, key):
+        found = super().__contains__(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def reset(self):
+        # created anew by every run, its statistics belong to the run that created it
+        del _caches[self.name]
+
+    def get_stats(self):
+        return {'name': self.name, 'hits': self.hits, 'misses': self.misses, 'evictions': 0,
+                'size': len(self), 'maxsize': None, 'footprint': get_footprint(self)}
+
+
+def reset_stats():
+    for cache in list(_caches.values()):
+        cache.reset()
+
+
+def get_stats():
+    # statistics of the caches used since the last reset
+    stats = [cache.get_stats() for cache in _caches.values()]
+    return [s for s in stats if s['hits'] or s['misses']]
+
+
+def format_stats(stats):
+    lines = []
+    for s in stats:
+        lookups = s['hits'] + s['misses']
+        maxsize = 'unbounded' if s['maxsize'] is None else s['maxsize']
+        lines.append(f'{s["name"]}: {s["hits"]} hits, {s["misses"]} misses ({s["hits"] / lookups:.1%} hit rate), '
+                     f'{s["evictions"]} evictions, {s["size"]}/{maxsize} entries, '
+                     f'{s["footprint"] / 2 ** 20:.2f} MiB')
+    return '\n'.join(lines)
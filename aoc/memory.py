@@ -0,0 +1,147 @@
+import os
+import signal
+import _thread
+import resource
+import threading
+import tracemalloc
+
+from aoc.paths import ROOT_DIR
+
+STATM_PATH = '/proc/self/statm'
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+# how often the watchdog thread samples the resident set size
+SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP_SITES = 5
+# delivered to the main thread by the watchdog when the ceiling is exceeded
+LIMIT_SIGNAL = signal.SIGUSR1
+# allocations made by the instrumentation itself are not reported
+IGNORED_FILES = [__file__, tracemalloc.__file__, threading.__file__, '<frozen importlib._bootstrap>',
+                 '<frozen importlib._bootstrap_external>']
+# snapshots of the allocation sites are costly with many live blocks, a new one is only taken when
+# traced memory has grown by this factor and this many bytes over the last one
+SNAPSHOT_GROWTH = 1.25
+SNAPSHOT_MIN_GROWTH = 2 ** 20
+
+
+class MemoryLimitExceeded(Exception):
+    pass
+
+
+def get_rss():
+    try:
+        with open(STATM_PATH, mode='r') as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        # no procfs (e.g. macOS), the peak so far is the best available estimate
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def format_site(statistic):
+    frame = statistic.traceback[0]
+    filename = os.path.relpath(frame.filename, ROOT_DIR) if frame.filename.startswith(ROOT_DIR) else frame.filename
+    return {'site': f'{filename}:{frame.lineno}', 'size': statistic.size, 'count': statistic.count}
+
+
+class MemoryWatch:
+    # records the peak RSS of the block it wraps, optionally the top allocation sites (tracemalloc,
+    # slows Python allocations down a lot), and raises MemoryLimitExceeded in the main thread once
+    # the RSS exceeds `limit` bytes
+    def __init__(self, limit=None, trace_allocations=False, top=DEFAULT_TOP_SITES):
+        self.limit = limit
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.start_rss = 0
+        self.peak_rss = 0
+        self.peak_traced = None
+        self.top_sites = []
+        self.exceeded = False
+        self._snapshot = None
+        self._snapshot_size = 0
+        self._active = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous_handler = None
+
+    def __enter__(self):
+        if self.limit is not None:
+            try:
+                self._previous_handler = signal.signal(LIMIT_SIGNAL, self._on_limit)
+            except ValueError:
+                # signal handlers can only be set in the main thread, the peak is still recorded
+                self._previous_handler = None
+        # sampled here as well, a block may end before the watchdog's first sample
+        self.start_rss = self.peak_rss = get_rss()
+        if self.trace_allocations:
+            tracemalloc.start()
+        self._active = True
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # a limit signal arriving from now on is ignored by the handler, the peak is checked below instead
+        self._active = False
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, get_rss())
+        if self.trace_allocations:
+            self._take_snapshot()
+            _, self.peak_traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot = self._snapshot.filter_traces([tracemalloc.Filter(False, f) for f in IGNORED_FILES])
+            self.top_sites = [format_site(s) for s in snapshot.statistics('lineno')[:self.top]]
+            self._snapshot = None
+        if self._previous_handler is not None:
+            signal.signal(LIMIT_SIGNAL, self._previous_handler)
+        # blocks that end before a sample exceeds the limit, or before its signal is handled, fail here
+        if self.limit is not None and self.peak_rss > self.limit and exc_type is None:
+            self.exceeded = True
+            raise MemoryLimitExceeded(self.get_limit_message())
+        return False
+
+    def _take_snapshot(self):
+        # the sites are reported as they were at the largest traced size seen, not at the end,
+        # when most of the memory may have been freed again
+        current, _ = tracemalloc.get_traced_memory()
+        threshold = max(self._snapshot_size * SNAPSHOT_GROWTH, self._snapshot_size + SNAPSHOT_MIN_GROWTH)
+        if self._snapshot_size == 0 or current > threshold:
+            # only taken here, summarising it while the solver runs would slow both down
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+
+    def _watch(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            if self.trace_allocations:
+                self._take_snapshot()
+            rss = get_rss()
+            self.peak_rss = max(self.peak_rss, rss)
+            if self.limit is not None and rss > self.limit and not self.exceeded:
+                self.exceeded = True
+                if self._previous_handler is not None:
+                    # raised the next time the main thread runs Python code, a long running
+                    # numpy call is only interrupted once it returns
+                    _thread.interrupt_main(LIMIT_SIGNAL)
+
+    def _on_limit(self, signum, frame):
+        if self._active:
+            raise MemoryLimitExceeded(self.get_limit_message())
+
+    def get_limit_message(self):
+        return f'RSS exceeded the memory limit of {self.limit / 2 ** 20:.1f} MiB'
+
+    def get_report(self):
+        report = {'start_rss': self.start_rss, 'peak_rss': self.peak_rss, 'exceeded': self.exceeded}
+        if self.trace_allocations:
+            report['peak_traced'] = self.peak_traced
+            report['top_sites'] = self.top_sites
+        return report
+
+
+def format_memory_report(report):
+    lines = [f'peak RSS {report["peak_rss"] / 2 ** 20:.1f} MiB '
+             f'(+{(report["peak_rss"] - report["start_rss"]) / 2 ** 20:.1f} MiB)']
+    if 'top_sites' in report:
+        lines[0] += f', peak traced {report["peak_traced"] / 2 ** 20:.1f} MiB'
+        for site in report['top_sites']:
+            lines.append(f'    {site["size"] / 2 ** 10:>10.1f} KiB {site["count"]:>8} blocks  {site["site"]}')
+    return '\n'.join(lines)
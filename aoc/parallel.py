@@ -0,0 +1,96 @@
+import os
+import importlib
+
+# several chunks per worker even out chunks whose cost was misjudged
+CHUNKS_PER_WORKER = 4
+# below this total cost (by default: number of records) starting the workers costs more than it saves
+DEFAULT_MIN_COST = 1000
+
+# workers start as fresh interpreters on every platform, rather than as forks of a parent that may run
+# threads (e.g. aoc.memory's sampler)
+START_METHOD = 'spawn'
+
+# at most this many workers per parallel_map, None for one per available CPU; e.g. workers of a
+# parallel run use 1, so that they do not start pools of their own
+_max_workers = None
+
+
+def available_cpus():
+    # respect the CPU affinity mask (e.g. taskset, containers), not just the machine's core count
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def set_max_workers(max_workers):
+    global _max_workers
+    _max_workers = max_workers
+
+
+def get_num_workers():
+    return available_cpus() if _max_workers is None else min(_max_workers, available_cpus())
+
+
+def get_chunks(records, costs, num_chunks):
+    # consecutive records of about equal total cost, as (records, cost) pairs
+    target = sum(costs) / num_chunks
+    chunks = []
+    chunk = []
+    chunk_cost = 0
+    for record, cost in zip(records, costs):
+        chunk.append(record)
+        chunk_cost += cost
+        if chunk_cost >= target:
+            chunks.append((chunk, chunk_cost))
+            chunk = []
+            chunk_cost = 0
+    if chunk:
+        chunks.append((chunk, chunk_cost))
+    return chunks
+
+
+def get_module_name(func):
+    while hasattr(func, 'func'):
+        # functools.partial
+        func = func.func
+    return func.__module__
+
+
+def import_module(module_name):
+    # functions are pickled by module and name, the day modules (see aoc.registry) are not importable
+    # by their name and are loaded from their day directory instead
+    from aoc.registry import MODULE_PREFIX, get_day
+    if module_name.startswith(MODULE_PREFIX):
+        get_day(int(module_name[len(MODULE_PREFIX):])).module
+    else:
+        importlib.import_module(module_name)
+
+
+def map_chunk(func, chunk):
+    return [func(record) for record in chunk]
+
+
+def parallel_map(func, records, cost=None, min_cost=DEFAULT_MIN_COST, num_workers=None):
+    # yields func(record) for every record, in order; with enough work the records are solved in a process
+    # pool, where each worker only receives its own chunks. `cost` estimates the work of a record
+    # (default 1), `func` must be a module-level function (or a functools.partial of one)
+    records = list(records)
+    costs = [cost(r) for r in records] if cost is not None else [1] * len(records)
+    num_workers = min(num_workers or get_num_workers(), len(records))
+    if num_workers <= 1 or sum(costs) < min_cost:
+        yield from map(func, records)
+        return
+    # only imported when there is a pool to start
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = get_chunks(records, costs, num_workers * CHUNKS_PER_WORKER)
+    # the module of `func` is imported by every worker before it unpickles its first chunk
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context(START_METHOD),
+                             initializer=import_module, initargs=(get_module_name(func),)) as executor:
+        # the costliest chunks start first, results are still yielded in record order
+        futures = {}
+        for i in sorted(range(len(chunks)), key=lambda i: chunks[i][1], reverse=True):
+            futures[i] = executor.submit(map_chunk, func, chunks[i][0])
+        for i in range(len(chunks)):
+            yield from futures[i].result()
@@ -0,0 +1,21 @@
+_NOT_PREPROCESSED = object()
+
+
+class LazyParts:
+    # the answers of both parts from one shared preprocess, returned by a day's `solve_parts`;
+    # the preprocess runs when the first answer is requested, each part's own work only when
+    # its answer is, e.g. answers = solve_parts(input); answers[2]
+    def __init__(self, preprocess, part_solvers):
+        # `preprocess` takes no arguments, each of `part_solvers` (by part) takes its result and
+        # must leave it usable for the other part
+        self._preprocess = preprocess
+        self._part_solvers = part_solvers
+        self._shared = _NOT_PREPROCESSED
+        self._answers = {}
+
+    def __getitem__(self, part):
+        if part not in self._answers:
+            if self._shared is _NOT_PREPROCESSED:
+                self._shared = self._preprocess()
+            self._answers[part] = self._part_solvers[part](self._shared)
+        return self._answers[part]
@@ -0,0 +1,11 @@
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# generated inputs, benchmark results and other local state - never committed
+CACHE_DIR = os.path.join(ROOT_DIR, '.aoc_cache')
+
+
+def get_cache_dir(*parts):
+    directory = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(directory, exist_ok=True)
+    return directory
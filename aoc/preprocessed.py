@@ -0,0 +1,80 @@
+import os
+import pickle
+import hashlib
+import functools
+
+from aoc.result_cache import get_package_hash, hash_file
+
+# preprocessed inputs are stored next to the input they were built from
+PREPROCESSED_DIR_NAME = '.preprocessed'
+PREPROCESSED_FORMAT_VERSION = 1
+
+# switched off for a whole run, e.g. when benchmarking the preprocessing itself
+_enabled = True
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def get_cache_key(input_path, func, args):
+    # the whole source file of the preprocessor is hashed, not just the function, and so is the aoc
+    # package, so changes to helpers or constants it uses (e.g. aoc.grid) also invalidate the entry
+    solver_path = func.__code__.co_filename
+    key = f'{PREPROCESSED_FORMAT_VERSION}:{hash_file(input_path)}:{func.__qualname__}:{hash_file(solver_path)}:' \
+          f'{get_package_hash()}:{args!r}'
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_entry_path(input_path, func):
+    directory = os.path.join(os.path.dirname(os.path.abspath(input_path)), PREPROCESSED_DIR_NAME)
+    return os.path.join(directory, f'{os.path.basename(input_path)}.{func.__qualname__}.pkl')
+
+
+def load_entry(path, key):
+    try:
+        with open(path, mode='rb') as file:
+            entry_key, value = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+        return None
+    if entry_key != key:
+        # stale, the input or the preprocessor changed
+        return None
+    return (value,)
+
+
+def store_entry(path, key, value):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, mode='wb') as file:
+            pickle.dump((key, value), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # e.g. a read-only input directory, the value is simply rebuilt next time
+        pass
+
+
+def cached_preprocess(func):
+    # cache the result of a preprocessor taking the input as its first argument,
+    # only inputs loaded from a file (see aoc.inputs.load_input) can be cached
+    @functools.wraps(func)
+    def wrapper(input, *args):
+        input_path = getattr(input, 'path', None)
+        if not _enabled or input_path is None:
+            return func(input, *args)
+        key = get_cache_key(input_path, func, args)
+        path = get_entry_path(input_path, func)
+        entry = load_entry(path, key)
+        if entry is not None:
+            return entry[0]
+        value = func(input, *args)
+        # stored right away, before the solver gets to modify the value
+        store_entry(path, key, value)
+        return value
+    return wrapper
@@ -0,0 +1,106 @@
+import io
+import os
+import pstats
+import cProfile
+
+from aoc.paths import get_cache_dir
+from aoc.registry import get_day
+
+PROFILES_DIR_NAME = 'profiles'
+DEFAULT_TOP_FUNCTIONS = 15
+# collapsed stacks count integer samples, one sample per microsecond
+COLLAPSED_UNIT = 10 ** 6
+MAX_STACK_DEPTH = 200
+# recorded by cProfile itself when profiling stops
+PROFILER_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def get_function_label(func):
+    filename, line, name = func
+    if filename == '~':
+        # built-in functions have no source location
+        return name.replace(';', ',')
+    return f'{name} ({os.path.basename(filename)}:{line})'.replace(';', ',')
+
+
+def get_call_graph(stats):
+    # pstats only keeps callers per function, flame graphs need callees
+    callees = {func: {} for func in stats.stats}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge
+    return roots, callees
+
+
+def collapse_stacks(stats):
+    # cProfile records caller/callee pairs, not full stacks; the time spent below a function is
+    # split between its callers in proportion to how much time each caller spent in it
+    roots, callees = get_call_graph(stats)
+    samples = {}
+
+    def walk(func, stack, self_time, total_time):
+        stack = stack + [get_function_label(func)]
+        key = ';'.join(stack)
+        samples[key] = samples.get(key, 0) + self_time
+        func_total_time = stats.stats[func][3]
+        if func_total_time <= 0 or len(stack) >= MAX_STACK_DEPTH:
+            return
+        share = min(1.0, total_time / func_total_time)
+        for callee, (_, _, edge_self_time, edge_total_time) in callees.get(func, {}).items():
+            if callee == func:
+                # direct recursion is folded into the function's own frame
+                samples[key] += edge_self_time * share
+                continue
+            if get_function_label(callee) in stack:
+                # indirect recursion is already part of the caller's time
+                continue
+            walk(callee, stack, edge_self_time * share, edge_total_time * share)
+
+    for root in roots:
+        if root[2] == PROFILER_DISABLE:
+            continue
+        _, _, root_self_time, root_total_time, _ = stats.stats[root]
+        walk(root, [], root_self_time, root_total_time)
+
+    lines = []
+    for stack, duration in samples.items():
+        count = int(round(duration * COLLAPSED_UNIT))
+        if count > 0:
+            lines.append(f'{stack} {count}')
+    return lines
+
+
+def format_top_functions(stats, top=DEFAULT_TOP_FUNCTIONS):
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return stream.getvalue()
+
+
+def profile_run(day_number, part, use_example_input=False, output_dir=None):
+    day = get_day(day_number)
+    # import and read the input before profiling, only `solve` is of interest
+    solve = day.module.solve
+    input = day.load_input(part, use_example_input)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        solution = solve(input, part)
+    finally:
+        profiler.disable()
+
+    if output_dir is None:
+        output_dir = get_cache_dir(PROFILES_DIR_NAME)
+    os.makedirs(output_dir, exist_ok=True)
+    example = '_example' if use_example_input else ''
+    basename = os.path.join(output_dir, f'day{day.name}_part{part}{example}')
+    stats_path = basename + '.pstats'
+    collapsed_path = basename + '.collapsed'
+    profiler.dump_stats(stats_path)
+    stats = pstats.Stats(profiler)
+    with open(collapsed_path, mode='w') as file:
+        file.write('\n'.join(collapse_stacks(stats)) + '\n')
+    return solution, stats, stats_path, collapsed_path
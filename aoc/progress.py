@@ -0,0 +1,80 @@
+import sys
+import time
+from itertools import islice
+
+# bright green, as 24-bit ANSI colour
+PROGRESS_COLOUR = "\033[38;2;51;255;170m"
+RESET_COLOUR = "\033[0m"
+BAR_WIDTH = 20
+# the display is redrawn at most this often, however fast the items come
+MIN_INTERVAL = 0.1
+MAX_CHUNK_SIZE = 2 ** 20
+
+# progress can be switched off for a whole run
+_enabled = True
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled and sys.stderr.isatty()
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes:02d}:{seconds:02d}'
+
+
+def format_progress(desc, count, total, elapsed):
+    rate = count / elapsed if elapsed > 0 else 0.0
+    prefix = f'{desc} ' if desc else ''
+    if total:
+        filled = min(BAR_WIDTH, BAR_WIDTH * count // total)
+        bar = f'{PROGRESS_COLOUR}{"█" * filled}{" " * (BAR_WIDTH - filled)}{RESET_COLOUR}'
+        return f'{prefix}{100 * count // total:3d}%|{bar}| {count}/{total} [{format_duration(elapsed)}, {rate:.0f} it/s]'
+    return f'{prefix}{count} [{format_duration(elapsed)}, {rate:.0f} it/s]'
+
+
+def _track(iterable, desc, total):
+    iterator = iter(iterable)
+    start = last_draw = time.perf_counter()
+    count = 0
+    # the clock is only read between chunks of items, the chunk size adapts so that this
+    # happens about as often as the display is redrawn
+    chunk_size = 1
+    try:
+        while True:
+            chunk_start = count
+            for count, item in enumerate(islice(iterator, chunk_size), count + 1):
+                yield item
+            if count - chunk_start < chunk_size:
+                # exhausted
+                break
+            now = time.perf_counter()
+            if now - last_draw >= MIN_INTERVAL:
+                sys.stderr.write('\r' + format_progress(desc, count, total, now - start))
+                sys.stderr.flush()
+                last_draw = now
+                chunk_size = max(1, chunk_size // 2)
+            else:
+                chunk_size = min(MAX_CHUNK_SIZE, chunk_size * 2)
+    finally:
+        # also when the loop over the items stops early
+        sys.stderr.write('\r' + format_progress(desc, count, total, time.perf_counter() - start) + '\n')
+        sys.stderr.flush()
+
+
+def track(iterable, desc=None, total=None):
+    # the iterable itself when disabled or not drawing to a terminal, so that there is no overhead
+    if not is_enabled():
+        return iterable
+    if total is None and hasattr(iterable, '__len__'):
+        total = len(iterable)
+    return _track(iterable, desc, total)
+
+
+def track_range(*args, desc=None):
+    return track(range(*args), desc)
@@ -0,0 +1,110 @@
+import os
+import re
+import sys
+import importlib.util
+
+from aoc.inputs import LINES, get_input_path, load_input, read_lines
+from aoc.paths import ROOT_DIR
+
+DAY_DIR_PATTERN = re.compile("^[0-9]{2}$")
+MODULE_PREFIX = 'aoc_day'
+PREPROCESS_PREFIX = 'preprocess_'
+
+_days = None
+
+
+class Day:
+    def __init__(self, number, directory):
+        self.number = number
+        self.name = f'{number:02d}'
+        self.directory = directory
+        self.module_name = MODULE_PREFIX + self.name
+        self.module_path = os.path.join(directory, f'day{self.name}.py')
+
+    def __repr__(self):
+        return f'Day({self.name})'
+
+    @property
+    def module(self):
+        # day modules are imported on first use only, and at most once per process
+        if self.module_name in sys.modules:
+            return sys.modules[self.module_name]
+        spec = importlib.util.spec_from_file_location(self.module_name, self.module_path)
+        module = importlib.util.module_from_spec(spec)
+        # register before executing so that pickling (multiprocessing) can find the module
+        sys.modules[self.module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[self.module_name]
+            raise
+        return module
+
+    def input_path(self, part, use_example_input=False):
+        return get_input_path(self.directory, self.number, part, use_example_input)
+
+    def input_mode(self, part):
+        mode = getattr(self.module, 'INPUT_MODE', LINES)
+        return mode[part] if isinstance(mode, dict) else mode
+
+    def read_input(self, part, use_example_input=False):
+        return read_lines(self.input_path(part, use_example_input))
+
+    def load_input(self, part, use_example_input=False, path=None):
+        # the input in the shape the day's `solve` consumes it (see aoc.inputs.INPUT_MODES)
+        if path is None:
+            path = self.input_path(part, use_example_input)
+        return load_input(path, self.input_mode(part))
+
+    def solve(self, input, part):
+        return self.module.solve(input, part)
+
+    @property
+    def has_solve_parts(self):
+        return callable(getattr(self.module, 'solve_parts', None))
+
+    def solve_parts(self, input):
+        # both parts from one shared preprocess, computed lazily (see aoc.parts.LazyParts)
+        return self.module.solve_parts(input)
+
+    def get_preprocessor(self, part):
+        # by convention a day parses with `preprocess_*`, optionally suffixed with
+        # `_part1`/`_part2` when the parts need different parsing
+        names = [n for n in dir(self.module) if n.startswith(PREPROCESS_PREFIX) and callable(getattr(self.module, n))]
+        part_names = [n for n in names if n.endswith(f'_part{part}')]
+        shared_names = [n for n in names if not re.search("_part[0-9]+$", n)]
+        candidates = part_names or shared_names
+        return getattr(self.module, candidates[0]) if len(candidates) == 1 else None
+
+    def reset_caches(self):
+        # memoised functions (e.g. lru_cache) would make repeated runs look faster than a cold one
+        for name in dir(self.module):
+            cache_clear = getattr(getattr(self.module, name), 'cache_clear', None)
+            if callable(cache_clear):
+                cache_clear()
+
+
+def discover_days(root_dir=ROOT_DIR):
+    days = {}
+    for entry in sorted(os.listdir(root_dir)):
+        directory = os.path.join(root_dir, entry)
+        if not DAY_DIR_PATTERN.match(entry) or not os.path.isdir(directory):
+            continue
+        day = Day(int(entry), directory)
+        if os.path.isfile(day.module_path):
+            days[day.number] = day
+    return days
+
+
+def get_days():
+    global _days
+    if _days is None:
+        _days = discover_days()
+    return _days
+
+
+def get_day(number):
+    days = get_days()
+    if number not in days:
+        raise KeyError(f'no solver registered for day {number}')
+    return days[number]
@@ -0,0 +1,102 @@
+import os
+import json
+import hashlib
+
+from aoc.paths import get_cache_dir
+
+RESULTS_DIR_NAME = 'results'
+# answers are tiny, this bounds the cache to a few tens of thousands of entries
+DEFAULT_MAX_CACHE_BYTES = 4 * 2 ** 20
+CACHE_FORMAT_VERSION = 1
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (modification times of the package's sources, their hash), rehashed only when a source changes
+_package_hash = (None, None)
+
+
+def to_json_value(value):
+    # numpy scalars are not JSON serialisable
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    return str(value)
+
+
+def hash_file(path):
+    with open(path, mode='rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def get_package_hash():
+    # the solvers build on the shared modules of the aoc package (parsers, inputs, grids, ...), so the
+    # answers depend on all of its sources, not just the day's
+    global _package_hash
+    paths = sorted(os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith('.py'))
+    mtimes = [(path, os.stat(path).st_mtime_ns) for path in paths]
+    if mtimes != _package_hash[0]:
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(f'{os.path.basename(path)}:{hash_file(path)}\n'.encode())
+        _package_hash = (mtimes, digest.hexdigest())
+    return _package_hash[1]
+
+
+def get_cache_key(input_path, part, solver_path):
+    # any change to the input bytes, the solver's source or the package it builds on gives a new key,
+    # so stale entries are never read, only evicted eventually
+    key = f'{CACHE_FORMAT_VERSION}:{hash_file(input_path)}:{part}:{hash_file(solver_path)}:{get_package_hash()}'
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_entry_path(key):
+    return os.path.join(get_cache_dir(RESULTS_DIR_NAME), f'{key}.json')
+
+
+def load_result(key):
+    path = get_entry_path(key)
+    try:
+        with open(path, mode='r') as file:
+            entry = json.load(file)
+        # mark as recently used for eviction
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def store_result(key, entry, max_bytes=DEFAULT_MAX_CACHE_BYTES):
+    path = get_entry_path(key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode='w') as file:
+        json.dump(entry, file)
+    os.replace(tmp_path, path)
+    evict(max_bytes)
+
+
+def evict(max_bytes=DEFAULT_MAX_CACHE_BYTES):
+    # drop the least recently used entries until the cache fits in `max_bytes`
+    directory = get_cache_dir(RESULTS_DIR_NAME)
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            # removed by a concurrent run
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name))
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+
+
+def clear():
+    evict(0)
@@ -0,0 +1,285 @@
+import os
+import sys
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc import memo, preprocessed, progress, result_cache, trace
+from aoc.memory import MemoryWatch, format_memory_report
+from aoc.parallel import available_cpus, set_max_workers
+from aoc.profiling import DEFAULT_TOP_FUNCTIONS, format_top_functions, profile_run
+from aoc.registry import get_day, get_days
+from aoc.result_cache import get_cache_key, load_result, store_result, to_json_value
+from aoc.startup import check_import_times, format_import_report
+from aoc.timings import load_timings, record_timings, sort_slowest_first
+
+PARTS = [1, 2]
+
+
+class RunResult:
+    def __init__(self, day, part, use_example_input, solution=None, duration=0.0, error=None, cached=False,
+                 path=None, memory=None, trace=None, cache_stats=None):
+        self.day = day
+        self.part = part
+        self.use_example_input = use_example_input
+        self.solution = solution
+        self.duration = duration
+        self.error = error
+        self.cached = cached
+        # only set when solving an input other than the day's own
+        self.path = path
+        # see aoc.memory.MemoryWatch.get_report, only set when memory is tracked
+        self.memory = memory
+        # the phase events of the run (see aoc.trace), only set when tracing
+        self.trace = trace
+        # see aoc.memo.get_stats, only set when cache statistics are collected
+        self.cache_stats = cache_stats
+
+    def __str__(self):
+        example = ' (example)' if self.use_example_input else ''
+        if self.error is not None:
+            text = f'Day {self.day:02d} part {self.part}{example}: FAILED\n{self.error}'
+        else:
+            cached = ' (cached)' if self.cached else ''
+            text = f'Day {self.day:02d} part {self.part}{example}: {self.solution}\t[{self.duration * 1000:.1f} ms]{cached}'
+        if self.memory is not None:
+            text += f'\n    {format_memory_report(self.memory)}'
+        if self.cache_stats:
+            text += ''.join(f'\n    {line}' for line in memo.format_stats(self.cache_stats).splitlines())
+        return text
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def load_input(day, part, use_example_input, path):
+    # the input and, when tracing, its number of records
+    with trace.phase('read_input') as p:
+        input = day.load_input(part, use_example_input, path)
+        if trace.is_enabled():
+            p.items = trace.count_items(input)
+            if p.items is None:
+                # streamed inputs are only read while solving, their lines are counted separately
+                p.items = trace.count_file_lines(path or day.input_path(part, use_example_input))
+    return input, p.items
+
+
+def run(day_number, part, use_example_input=False, use_cache=False, path=None, track_memory=False,
+        memory_limit=None, shared_answers=None, cache_stats=False):
+    # `path` solves another input file instead of the day's own; `track_memory` records the peak RSS and
+    # top allocation sites, `memory_limit` (bytes) fails the run once its RSS exceeds it;
+    # `shared_answers` keeps the answers of days with `solve_parts` by input, for the next part to reuse;
+    # `cache_stats` collects the statistics of the memoisation layers used while solving
+    day = get_day(day_number)
+    input_path = path or day.input_path(part, use_example_input)
+    memory = None
+    events = None
+    stats = None
+    try:
+        cache_key = None
+        if use_cache:
+            # the key only needs the files' bytes, a hit neither imports nor solves the day
+            start = time.perf_counter()
+            cache_key = get_cache_key(input_path, part, day.module_path)
+            entry = load_result(cache_key)
+            if entry is not None:
+                duration = time.perf_counter() - start
+                return RunResult(day_number, part, use_example_input, entry['solution'], duration, cached=True,
+                                 path=path)
+        # import the day module before the clock starts
+        day.module
+        if cache_stats:
+            memo.reset_stats()
+        with trace.record() as events:
+            if shared_answers is not None and day.has_solve_parts:
+                # the first part to run also pays for the shared preprocess
+                key = (day_number, input_path)
+                if key not in shared_answers:
+                    input, items = load_input(day, part, use_example_input, path)
+                    shared_answers[key] = (day.solve_parts(input), items)
+                answers, items = shared_answers[key]
+
+                def solve():
+                    return answers[part]
+            else:
+                input, items = load_input(day, part, use_example_input, path)
+
+                def solve():
+                    return day.solve(input, part)
+            if track_memory or memory_limit is not None:
+                watch = MemoryWatch(memory_limit, trace_allocations=track_memory)
+                start = time.perf_counter()
+                try:
+                    with watch, trace.phase('solve', items):
+                        solution = solve()
+                finally:
+                    memory = watch.get_report()
+            else:
+                start = time.perf_counter()
+                with trace.phase('solve', items):
+                    solution = solve()
+            duration = time.perf_counter() - start
+        if cache_stats:
+            stats = memo.get_stats()
+        if cache_key is not None:
+            store_result(cache_key, {'day': day_number, 'part': part, 'solution': to_json_value(solution),
+                                     'duration': duration})
+    except Exception:
+        # one failing day should not stop the remaining days of a run
+        return RunResult(day_number, part, use_example_input, error=traceback.format_exc(), path=path,
+                         memory=memory, trace=events, cache_stats=memo.get_stats() if cache_stats else None)
+    return RunResult(day_number, part, use_example_input, solution, duration, path=path, memory=memory,
+                     trace=events, cache_stats=stats)
+
+
+def get_jobs(day_numbers, parts, use_example_input=False):
+    return [(d, p, use_example_input) for d in day_numbers for p in parts]
+
+
+def run_serial(jobs, use_cache=False, **run_options):
+    # the parts of a day reading the same input share its preprocess, unless memory is tracked per part
+    shared_answers = None if run_options.get('track_memory') else {}
+    previous_day = None
+    for job in jobs:
+        if shared_answers is not None and job[0] != previous_day:
+            # only the current day's answers are kept alive
+            shared_answers.clear()
+            previous_day = job[0]
+        yield run(*job, use_cache=use_cache, shared_answers=shared_answers, **run_options)
+
+
+def init_worker(show_progress, use_cache, use_trace=False):
+    # the workers already use every CPU, the days' parallel maps run serially inside them
+    set_max_workers(1)
+    progress.set_enabled(show_progress)
+    preprocessed.set_enabled(use_cache)
+    trace.set_enabled(use_trace)
+
+
+def run_parallel(jobs, num_workers, use_cache=False, **run_options):
+    # start the slowest jobs first, so that the run takes about as long as the slowest job
+    # instead of ending with it; results are still yielded in the original job order
+    schedule = sort_slowest_first(jobs, load_timings())
+    # progress bars of concurrent jobs would be drawn over each other
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker,
+                             initargs=(False, use_cache, trace.is_enabled())) as executor:
+        futures = {job: executor.submit(run, *job, use_cache=use_cache, **run_options) for job in schedule}
+        for job in jobs:
+            yield futures[job].result()
+
+
+def get_trace_events(results):
+    # the phases of every day/part, labelled with the day/part they belong to;
+    # answers from the result cache have no phases
+    for r in results:
+        for event in r.trace or []:
+            yield dict({'day': r.day, 'part': r.part, 'example': r.use_example_input,
+                        'input': os.path.basename(r.path) if r.path else None}, **event)
+
+
+def write_trace(results, path):
+    if path == '-':
+        trace.write_trace(get_trace_events(results), sys.stderr)
+        return
+    with open(path, mode='w') as file:
+        trace.write_trace(get_trace_events(results), file)
+
+
+def profile(args):
+    for day_number, part, use_example_input in get_jobs(args.days, args.parts, args.example):
+        solution, stats, stats_path, collapsed_path = profile_run(day_number, part, use_example_input,
+                                                                  args.profile_dir)
+        example = ' (example)' if use_example_input else ''
+        print(f'Day {day_number:02d} part {part}{example}: {solution}')
+        print(f'pstats: {stats_path}\ncollapsed stacks: {collapsed_path}')
+        print(format_top_functions(stats, args.profile_top))
+    return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc', description='Run Advent of Code 2023 solvers in one process')
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument('-p', '--parts', nargs='+', type=int, choices=PARTS, default=PARTS,
+                        help='parts to run (default: both)')
+    parser.add_argument('-e', '--example', action='store_true',
+                        help='use example_input.txt (part 1) and example_input2.txt (part 2)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of days/parts to run concurrently, 0 = one per available CPU (default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always solve, neither reading nor writing the result cache in .aoc_cache/results '
+                             'nor the preprocessed inputs in .preprocessed next to the inputs')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='remove every cached answer from .aoc_cache/results and exit')
+    parser.add_argument('--no-progress', action='store_true', help='disable progress bars')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile solve() with cProfile, writing .pstats and collapsed stacks for flame graphs')
+    parser.add_argument('--profile-dir', help='directory for profile output (default: .aoc_cache/profiles)')
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP_FUNCTIONS,
+                        help='number of hot functions to print with --profile')
+    parser.add_argument('--memory', action='store_true',
+                        help='report the peak RSS and top allocation sites (tracemalloc, slow) of every day/part')
+    parser.add_argument('--memory-limit', type=float, metavar='MIB',
+                        help='fail a day/part whose RSS exceeds this many MiB')
+    parser.add_argument('--cache-stats', action='store_true',
+                        help='report hits, misses, evictions, size and footprint of the memoised functions and '
+                             'caches (aoc.memo) every day/part used; cached answers are not used')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='write the duration and item count of every phase (read_input, preprocess_*, '
+                             'solve_part*, solve) of every day/part as JSON lines to PATH ("-" for stderr)')
+    parser.add_argument('--import-times', action='store_true',
+                        help='measure the import time of each day in a fresh interpreter against its budget')
+    parser.add_argument('--import-budget', type=float, help='import time budget in ms for every day (with --import-times)')
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error('--jobs must not be negative')
+    if args.memory_limit is not None and args.memory_limit <= 0:
+        parser.error('--memory-limit must be positive')
+    if args.memory or args.cache_stats or args.trace is not None:
+        # answers and preprocessed inputs loaded from the cache would hide the allocations, cache lookups
+        # and phases
+        args.no_cache = True
+    available_days = get_days()
+    for d in args.days:
+        if d not in available_days:
+            parser.error(f'no solver for day {d}, available: {sorted(available_days)}')
+    if not args.days:
+        args.days = sorted(available_days)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.clear_cache:
+        result_cache.clear()
+        return 0
+    if args.import_times:
+        reports = check_import_times(args.days, budget_ms=args.import_budget)
+        print(format_import_report(reports))
+        return 0 if all(r['ok'] for r in reports) else 1
+
+    progress.set_enabled(not args.no_progress)
+    preprocessed.set_enabled(not args.no_cache)
+    trace.set_enabled(args.trace is not None)
+    if args.profile:
+        return profile(args)
+
+    jobs = get_jobs(args.days, args.parts, args.example)
+    num_workers = min(args.jobs if args.jobs > 0 else available_cpus(), len(jobs))
+    use_cache = not args.no_cache
+    memory_limit = args.memory_limit * 2 ** 20 if args.memory_limit is not None else None
+    run_options = {'track_memory': args.memory, 'memory_limit': memory_limit, 'cache_stats': args.cache_stats}
+    if num_workers > 1:
+        results = run_parallel(jobs, num_workers, use_cache, **run_options)
+    else:
+        results = run_serial(jobs, use_cache, **run_options)
+    all_results = []
+    for result in results:
+        all_results.append(result)
+        print(result, flush=True)
+    if args.trace is not None:
+        write_trace(all_results, args.trace)
+    # remembered to schedule the slowest jobs first in later parallel runs
+    record_timings(all_results)
+    return 0 if all(r.ok for r in all_results) else 1
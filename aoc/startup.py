@@ -0,0 +1,76 @@
+import sys
+import json
+import statistics
+import subprocess
+
+from aoc.paths import ROOT_DIR
+
+DEFAULT_IMPORT_BUDGET_MS = 25
+# days that need numpy for both parts pay for importing it up front
+NUMPY_IMPORT_BUDGET_MS = 200
+IMPORT_BUDGETS_MS = {
+    2: NUMPY_IMPORT_BUDGET_MS,
+    3: NUMPY_IMPORT_BUDGET_MS,
+    9: NUMPY_IMPORT_BUDGET_MS,
+    10: NUMPY_IMPORT_BUDGET_MS,
+    11: NUMPY_IMPORT_BUDGET_MS,
+    13: NUMPY_IMPORT_BUDGET_MS,
+    14: NUMPY_IMPORT_BUDGET_MS,
+}
+# third party or otherwise slow imports that should only be loaded by the code paths needing them
+HEAVY_MODULES = ['numpy', 'shapely', 'multiprocessing']
+DEFAULT_IMPORT_REPEATS = 3
+
+# runs in a fresh interpreter, so that nothing is imported already
+IMPORT_PROBE = '''
+import sys
+import json
+import time
+from aoc import progress
+from aoc.registry import get_day
+
+progress.set_enabled(False)
+day = get_day({day_number})
+loaded_before = set(sys.modules)
+start = time.perf_counter()
+day.module
+duration = time.perf_counter() - start
+heavy = [m for m in {heavy_modules!r} if m in sys.modules and m not in loaded_before]
+print(json.dumps({{'duration': duration, 'heavy_modules': heavy}}))
+'''
+
+
+def get_import_budget(day_number):
+    return IMPORT_BUDGETS_MS.get(day_number, DEFAULT_IMPORT_BUDGET_MS)
+
+
+def measure_import_time(day_number):
+    probe = IMPORT_PROBE.format(day_number=day_number, heavy_modules=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT_DIR, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def check_import_times(day_numbers, repeats=DEFAULT_IMPORT_REPEATS, budget_ms=None):
+    reports = []
+    for day_number in day_numbers:
+        measurements = [measure_import_time(day_number) for _ in range(repeats)]
+        duration_ms = statistics.median(m['duration'] for m in measurements) * 1000
+        budget = get_import_budget(day_number) if budget_ms is None else budget_ms
+        reports.append({
+            'day': day_number,
+            'import_ms': duration_ms,
+            'budget_ms': budget,
+            'heavy_modules': measurements[0]['heavy_modules'],
+            'ok': duration_ms <= budget,
+        })
+    return reports
+
+
+def format_import_report(reports):
+    rows = [f'{"day":>3} {"import ms":>10} {"budget ms":>10}  {"status":<6}  heavy imports']
+    for r in reports:
+        status = 'ok' if r['ok'] else 'OVER'
+        rows.append(f'{r["day"]:>3} {r["import_ms"]:>10.1f} {r["budget_ms"]:>10.1f}  {status:<6}  '
+                    f'{", ".join(r["heavy_modules"]) or "-"}')
+    return '\n'.join(rows)
@@ -0,0 +1,49 @@
+import os
+import json
+
+from aoc.paths import CACHE_DIR, get_cache_dir
+
+TIMINGS_FILENAME = 'timings.json'
+
+
+def get_timings_path():
+    return os.path.join(CACHE_DIR, TIMINGS_FILENAME)
+
+
+def get_job_key(day_number, part, use_example_input=False):
+    return f'{day_number}:{part}:{int(use_example_input)}'
+
+
+def load_timings():
+    try:
+        with open(get_timings_path(), mode='r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        # no runs recorded yet, or a broken file - start over
+        return {}
+
+
+def save_timings(timings):
+    get_cache_dir()
+    path = get_timings_path()
+    # write to a temporary file first, so that concurrent runs never read a partial file
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode='w') as file:
+        json.dump(timings, file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def record_timings(results):
+    timings = load_timings()
+    for result in results:
+        # a cached result says nothing about how long solving takes
+        if result.ok and not result.cached:
+            timings[get_job_key(result.day, result.part, result.use_example_input)] = result.duration
+    save_timings(timings)
+
+
+def sort_slowest_first(jobs, timings):
+    # jobs without a recorded timing might be slow, so they are started first too
+    def expected_duration(job):
+        return timings.get(get_job_key(*job), float('inf'))
+    return sorted(jobs, key=expected_duration, reverse=True)
@@ -0,0 +1,118 @@
+import json
+import mmap
+import time
+import functools
+
+# tracing is switched on for a whole run, e.g. by the runner's --trace
+_enabled = False
+# the events of the run being recorded, None when nothing is recorded
+_events = None
+# names of the phases currently running, innermost last
+_stack = []
+_start = 0.0
+# bytes of a buffer or file whose line breaks are counted at a time
+COUNT_CHUNK_SIZE = 2 ** 20
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def count_items(value):
+    # the records of a phase's result or input: the lines of a text or buffer, the length of any other
+    # sized value; tuples bundle several results of a phase, the first one (e.g. the games next to
+    # their maxima) is counted; None for values without a count, e.g. streams and single answers
+    if isinstance(value, tuple):
+        return count_items(value[0]) if value else None
+    if isinstance(value, str):
+        return value.count('\n') + (len(value) > 0 and not value.endswith('\n'))
+    if isinstance(value, (bytes, mmap.mmap)):
+        # memory maps cannot count, their slices can; slicing a chunk at a time bounds the copies
+        line_breaks = sum(value[i:i + COUNT_CHUNK_SIZE].count(b'\n') for i in range(0, len(value), COUNT_CHUNK_SIZE))
+        return line_breaks + (len(value) > 0 and value[-1:] != b'\n')
+    if not hasattr(value, '__len__'):
+        return None
+    return len(value)
+
+
+def count_file_lines(path):
+    # the lines of a file, for inputs that are only read while solving (streams)
+    line_breaks = 0
+    last_byte = b''
+    with open(path, mode='rb') as file:
+        for chunk in iter(functools.partial(file.read, COUNT_CHUNK_SIZE), b''):
+            line_breaks += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+    return line_breaks + (last_byte not in (b'', b'\n'))
+
+
+class phase:
+    # times a block as one phase of the run being recorded, e.g.
+    # with trace.phase('read_input') as p: ...; p.items = len(input)
+    def __init__(self, name, items=None):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        if _events is not None:
+            self.parent = _stack[-1] if _stack else None
+            _stack.append(self.name)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if _events is not None:
+            end = time.perf_counter()
+            _stack.pop()
+            _events.append({'phase': self.name, 'parent': self.parent, 'start': self.start - _start,
+                            'duration': end - self.start, 'items': self.items, 'ok': exc_type is None})
+        return False
+
+
+def traced(func=None, name=None, items=count_items):
+    # times every call of a day's phase function, `items` counts the items of its result, or of its
+    # first argument if the result has no count (e.g. a part's answer); while nothing is recorded the
+    # call goes straight through
+    if func is None:
+        return functools.partial(traced, name=name, items=items)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _events is None:
+            return func(*args, **kwargs)
+        with phase(name or func.__name__) as p:
+            result = func(*args, **kwargs)
+            p.items = items(result)
+            if p.items is None and args:
+                p.items = items(args[0])
+        return result
+    return wrapper
+
+
+class record:
+    # collects the phases of one day/part, e.g. with trace.record() as events: ...;
+    # `events` is None when tracing is disabled
+    def __enter__(self):
+        global _events, _start
+        self.events = [] if _enabled else None
+        if _enabled:
+            _events = self.events
+            _stack.clear()
+            _start = time.perf_counter()
+        return self.events
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        global _events
+        _events = None
+        return False
+
+
+def write_trace(events, file):
+    # JSON lines, one event per line
+    for event in events:
+        file.write(json.dumps(event) + '\n')
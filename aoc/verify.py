@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import math
+import argparse
+
+from aoc import preprocessed, progress
+from aoc.parallel import available_cpus
+from aoc.paths import ROOT_DIR
+from aoc.registry import get_days
+from aoc.result_cache import to_json_value
+from aoc.runner import PARTS, get_jobs, run_parallel, run_serial
+
+EXPECTED_PATH = os.path.join(ROOT_DIR, 'expected.json')
+# recorded budgets leave room for slower machines and concurrent runs, but not for a 10x slowdown
+BUDGET_FACTOR = 3
+# only keeps the budgets of the fastest days above timer and scheduling noise
+MIN_BUDGET_MS = 10
+
+
+def load_expected(path=EXPECTED_PATH):
+    try:
+        with open(path, mode='r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_expected(expected, path=EXPECTED_PATH):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode='w') as file:
+        json.dump(expected, file, indent=2, sort_keys=True)
+        file.write('\n')
+    os.replace(tmp_path, path)
+
+
+def get_answers_key(use_example_input):
+    return 'example_answers' if use_example_input else 'answers'
+
+
+def get_expected_answer(expected, result):
+    # None if no answer is recorded, e.g. for an example that has no valid answer
+    day_expected = expected.get(f'{result.day:02d}', {})
+    return day_expected.get(get_answers_key(result.use_example_input), {}).get(str(result.part))
+
+
+def check_result(expected, result):
+    if not result.ok:
+        return 'FAILED'
+    expected_answer = get_expected_answer(expected, result)
+    if expected_answer is None:
+        return 'unchecked'
+    return 'ok' if str(to_json_value(result.solution)) == str(expected_answer) else 'WRONG'
+
+
+def get_day_durations(results):
+    # wall time of solving the real input, summed over the parts of each day
+    durations = {}
+    for r in results:
+        if not r.use_example_input and r.ok:
+            durations[r.day] = durations.get(r.day, 0.0) + r.duration
+    return durations
+
+
+def check_budgets(expected, results, budget_scale=1.0):
+    checks = []
+    for day_number, duration in sorted(get_day_durations(results).items()):
+        budget_ms = expected.get(f'{day_number:02d}', {}).get('budget_ms')
+        if budget_ms is None:
+            continue
+        budget_ms *= budget_scale
+        checks.append({'day': day_number, 'duration_ms': duration * 1000, 'budget_ms': budget_ms,
+                       'ok': duration * 1000 <= budget_ms})
+    return checks
+
+
+def round_up(value, digits=2):
+    # to `digits` significant digits, e.g. 1234 -> 1300
+    magnitude = 10 ** max(0, math.floor(math.log10(value)) - digits + 1)
+    return math.ceil(value / magnitude) * magnitude
+
+
+def record_expected(expected, results):
+    # answers of failed runs are never recorded
+    for r in results:
+        if r.ok:
+            day_expected = expected.setdefault(f'{r.day:02d}', {})
+            day_expected.setdefault(get_answers_key(r.use_example_input), {})[str(r.part)] = \
+                to_json_value(r.solution)
+    for day_number, duration in get_day_durations(results).items():
+        budget_ms = max(MIN_BUDGET_MS, round_up(duration * 1000 * BUDGET_FACTOR))
+        expected[f'{day_number:02d}']['budget_ms'] = budget_ms
+    return expected
+
+
+def format_report(expected, results, budget_checks):
+    lines = [f'{"day":>3} {"part":>4} {"input":>7} {"answer":>20} {"expected":>20} {"ms":>10}  status']
+    for r in results:
+        label = 'example' if r.use_example_input else 'real'
+        answer = to_json_value(r.solution) if r.ok else '-'
+        expected_answer = get_expected_answer(expected, r)
+        expected_answer = '-' if expected_answer is None else expected_answer
+        lines.append(f'{r.day:>3} {r.part:>4} {label:>7} {answer!s:>20} {expected_answer!s:>20} '
+                     f'{r.duration * 1000:>10.1f}  {check_result(expected, r)}')
+    lines.append('')
+    lines.append(f'{"day":>3} {"ms":>10} {"budget ms":>10}  status')
+    for check in budget_checks:
+        status = 'ok' if check['ok'] else 'OVER BUDGET'
+        lines.append(f'{check["day"]:>3} {check["duration_ms"]:>10.1f} {check["budget_ms"]:>10.0f}  {status}')
+    return '\n'.join(lines)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='aoc.verify',
+                                     description='Check every day against its recorded answers and time budget')
+    parser.add_argument('days', nargs='*', type=int, help='days to verify (default: all)')
+    parser.add_argument('-p', '--parts', nargs='+', type=int, choices=PARTS, default=PARTS,
+                        help='parts to verify (default: both)')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of days/parts to run concurrently (default: 0 = one per available CPU)')
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help='multiply every time budget, e.g. 2 on a machine half as fast')
+    parser.add_argument('--record', action='store_true',
+                        help=f'record the answers and budgets ({BUDGET_FACTOR}x the measured time) '
+                             f'of the verified days in {os.path.basename(EXPECTED_PATH)}')
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error('--jobs must not be negative')
+    if args.budget_scale <= 0:
+        parser.error('--budget-scale must be positive')
+    available_days = get_days()
+    for d in args.days:
+        if d not in available_days:
+            parser.error(f'no solver for day {d}, available: {sorted(available_days)}')
+    if not args.days:
+        args.days = sorted(available_days)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    progress.set_enabled(False)
+    # answers and preprocessed inputs are solved fresh, so that the times are real
+    preprocessed.set_enabled(False)
+    jobs = get_jobs(args.days, args.parts) + get_jobs(args.days, args.parts, use_example_input=True)
+    num_workers = min(args.jobs if args.jobs > 0 else available_cpus(), len(jobs))
+    if num_workers > 1:
+        results = list(run_parallel(jobs, num_workers))
+    else:
+        results = list(run_serial(jobs))
+    expected = load_expected()
+    if args.record:
+        save_expected(record_expected(expected, results))
+    budget_checks = check_budgets(expected, results, args.budget_scale)
+    print(format_report(expected, results, budget_checks))
+    checks = [check_result(expected, r) for r in results]
+    failed = sum(c in ('FAILED', 'WRONG') for c in checks) + sum(not c['ok'] for c in budget_checks)
+    print(f'{len(results)} runs, {checks.count("ok")} correct, {checks.count("unchecked")} unchecked, '
+          f'{failed} failed')
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())